@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+def column(rows, index):
+    """Returns one column of CSV rows as a list."""
+    return [row[index] for row in rows]
+
+
+def parse_installs(installs):
+    """Parses Google Play install counts like "10,000+" into a float64 array in one pass.
+
+    Counts that do not parse (e.g. "Free" in the malformed row) are NaN, which category_totals
+    leaves out of the sums.
+    """
+    digits = pd.Series(installs, dtype="string").str.replace(r"[,+]", "", regex=True)
+    return pd.to_numeric(digits, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+@dataclass
+class CategoryTotals:
+    """Per-category counts and (weighted) sums that can be merged across chunks.
+
+    The table is indexed by category, with a "count" column and, for every value, a "<name>_sum"
+    column (sum of weight * value) and a "<name>_weight" column (sum of weights).
+    """
+    table: pd.DataFrame
+
+    def merge(self, other):
+        """Combines the totals of two chunks into the totals of both."""
+        return CategoryTotals(self.table.add(other.table, fill_value=0))
+
+    def counts(self):
+        return self.table["count"].astype("int64").sort_values(ascending=False)
+
+    def percentages(self):
+        """Frequency table: share of all rows in each category, in percent, largest first."""
+        counts = self.counts()
+        return counts * 100 / counts.sum()
+
+    def averages(self):
+        """Weighted average of every value per category."""
+        names = [c[: -len("_sum")] for c in self.table.columns if c.endswith("_sum")]
+        return pd.DataFrame(
+            {name: self.table[f"{name}_sum"] / self.table[f"{name}_weight"] for name in names}
+        )
+
+
+def category_totals(categories, values=None, weights=None):
+    """Computes CategoryTotals for one chunk with one np.bincount per column.
+
+    Args:
+    - categories (list): category of every row, e.g. column(rows, 11) for iOS genres
+    - values (dict): value name -> numeric array-like with one value per row
+    - weights (dict): value name -> weights per row; values without weights are plain averages
+
+    Rows whose value or weight is NaN are left out of that value's sum and weight.
+    """
+    values = values or {}
+    weights = weights or {}
+    codes, uniques = pd.factorize(np.asarray(categories, dtype=object))
+
+    table = {"count": np.bincount(codes, minlength=len(uniques))}
+    for name, value in values.items():
+        value = np.asarray(value, dtype="float64")
+        weight = np.asarray(weights.get(name, np.ones(len(value))), dtype="float64")
+        weight = np.where(np.isnan(value), 0.0, np.nan_to_num(weight))
+        value = np.nan_to_num(value)
+        table[f"{name}_sum"] = np.bincount(codes, value * weight, minlength=len(uniques))
+        table[f"{name}_weight"] = np.bincount(codes, weight, minlength=len(uniques))
+
+    return CategoryTotals(pd.DataFrame(table, index=pd.Index(uniques, name="category")))
+
+
+def chunked_totals(chunks, totals_of_chunk):
+    """Merges the CategoryTotals of each chunk, so only one chunk is in memory at a time.
+
+    Args:
+    - chunks (iterable): chunks of rows, e.g. successive batches read from a large CSV
+    - totals_of_chunk (function): turns a chunk into CategoryTotals
+    """
+    merged = None
+    for chunk in chunks:
+        totals = totals_of_chunk(chunk)
+        merged = totals if merged is None else merged.merge(totals)
+    return merged
@@ -0,0 +1,87 @@
+"""Benchmarks cleaning.clean and english_mask against the notebook's loops on a synthetic store listing.
+
+Usage: python benchmark_cleaning.py [--rows 10000000] [--legacy-rows 20000]
+"""
+import argparse
+import random
+import time
+
+from cleaning import clean, english_mask, is_english
+
+NAMES = ["Photo Editor", "Coloring book", "Docs To Go™ Free Office Suite", "爱奇艺PPS -《欢乐颂2》电视剧热播", "Instachat 😜"]
+PRICES = ["0", "0", "0", "$0.99", "$4.99"]
+
+
+def synthetic_gplay(n_rows, n_apps, seed=0):
+    """Yields Google Play style rows; about 1 in 1,000 is malformed and names repeat across rows."""
+    rng = random.Random(seed)
+    for i in range(n_rows):
+        app = rng.randrange(n_apps)
+        row = [
+            f"{NAMES[app % len(NAMES)]} {app}", "FAMILY", "4.1", str(rng.randrange(100000)), "19M",
+            "10,000+", "Free", PRICES[app % len(PRICES)], "Everyone", "Casual", "January 7, 2018",
+            "1.0.0", "4.0.3 and up",
+        ]
+        if i % 1000 == 999:
+            del row[1]
+        yield row
+
+
+def legacy_clean(gplay):
+    """The notebook's cleaning: list membership checks and one full pass per filter."""
+    gplay = [app for app in gplay if len(app) == 13]
+
+    reviews_max = {}
+    for app in gplay:
+        name = app[0]
+        n_reviews = float(app[3])
+        if name in reviews_max and reviews_max[name] < n_reviews:
+            reviews_max[name] = n_reviews
+        elif name not in reviews_max:
+            reviews_max[name] = n_reviews
+
+    android_clean = []
+    already_added = []
+    for app in gplay:
+        name = app[0]
+        n_reviews = float(app[3])
+        if (n_reviews == reviews_max[name]) and (name not in already_added):
+            android_clean.append(app)
+            already_added.append(name)
+
+    gplay_english = [app for app in android_clean if is_english(app[0])]
+    return [app for app in gplay_english if float(app[7].lstrip("$")) == 0]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    sample = list(synthetic_gplay(args.legacy_rows, args.legacy_rows // 2))
+    legacy, legacy_seconds = timed(legacy_clean, sample)
+    fused, fused_seconds = timed(clean, sample, "gplay")
+    assert sorted(map(tuple, legacy)) == sorted(map(tuple, fused))
+    print(f"{args.legacy_rows:,} rows: notebook {legacy_seconds:.2f}s, pipeline {fused_seconds:.2f}s")
+
+    names = [row[0] for row in synthetic_gplay(args.rows, args.rows // 2)]
+    per_char, per_char_seconds = timed(lambda: [is_english(name) for name in names])
+    vectorized, vectorized_seconds = timed(english_mask, names)
+    assert per_char == vectorized.tolist()
+    print(f"{args.rows:,} names: is_english loop {per_char_seconds:.2f}s, english_mask {vectorized_seconds:.2f}s")
+    del names
+
+    # The full-size listing is streamed straight into the pipeline and never held as a list
+    fused, fused_seconds = timed(clean, synthetic_gplay(args.rows, args.rows // 2), "gplay")
+    print(f"{args.rows:,} rows: pipeline {fused_seconds:.2f}s, {len(fused):,} free English apps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+from csv import reader
+from itertools import islice
+
+import numpy as np
+
+# Column positions of each store's CSV rows
+STORES = {
+    "ios": {"columns": 16, "key": 0, "name": 1, "reviews": 5, "price": 4},
+    "gplay": {"columns": 13, "key": 0, "name": 0, "reviews": 3, "price": 7},
+}
+
+
+def is_english(string):
+    not_ascii = 0
+    for char in string:
+        if ord(char) > 127:
+            not_ascii += 1
+    if not_ascii > 3:
+        return False
+    else:
+        return True
+
+
+def non_ascii_counts(strings):
+    """Returns the number of non-ASCII characters in each string, counted for all strings at once.
+
+    Pure-ASCII strings are skipped with str.isascii. The rest are joined and encoded to UTF-32,
+    so every character becomes one uint32 code point, and the code points above 127 are binned
+    back to the string they came from.
+    """
+    strings = list(strings)
+    counts = np.zeros(len(strings), dtype=np.int64)
+    mixed = np.flatnonzero([not string.isascii() for string in strings])
+    if len(mixed) == 0:
+        return counts
+
+    subset = [strings[i] for i in mixed]
+    ends = np.cumsum(np.fromiter(map(len, subset), dtype=np.int64, count=len(subset)))
+    codes = np.frombuffer("".join(subset).encode("utf-32-le", "surrogatepass"), dtype="<u4")
+    owners = np.searchsorted(ends, np.flatnonzero(codes > 127), side="right")
+    counts[mixed] = np.bincount(owners, minlength=len(subset))
+    return counts
+
+
+def english_mask(strings, max_non_ascii=3):
+    """Vectorized is_english: True for strings with at most max_non_ascii non-ASCII characters."""
+    return non_ascii_counts(strings) <= max_non_ascii
+
+
+def parse_price(price):
+    return float(price.lstrip("$"))
+
+
+def read_rows(path):
+    """Yields the data rows of a store CSV one at a time, without the header."""
+    with open(path, encoding="utf8") as opened:
+        rows = reader(opened)
+        next(rows)
+        yield from rows
+
+
+def clean(rows, store, batch_size=100_000):
+    """Returns the free, English, de-duplicated apps of a store in one pass over its rows.
+
+    Rows with the wrong number of columns or unparseable numbers are dropped, then apps with
+    more than three non-ASCII characters in their name. Duplicates (same key column) are
+    resolved in a dict keeping the first row with the most reviews. The price filter is applied
+    to the kept rows only, so an app whose most-reviewed listing is paid is dropped, as in the
+    notebook.
+
+    Args:
+    - rows (iterable): CSV rows as lists of strings, e.g. from read_rows
+    - store (str): "ios" or "gplay", see STORES
+    - batch_size (int): rows whose names are checked together by english_mask
+    """
+    columns = STORES[store]
+    n_columns = columns["columns"]
+    key, name, reviews, price = columns["key"], columns["name"], columns["reviews"], columns["price"]
+
+    rows = iter(rows)
+    kept = {}
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+
+        batch = [row for row in batch if len(row) == n_columns]
+        english = english_mask([row[name] for row in batch])
+        for row, is_english_name in zip(batch, english):
+            if not is_english_name:
+                continue
+            try:
+                n_reviews = float(row[reviews])
+            except ValueError:
+                continue
+
+            current = kept.get(row[key])
+            if current is None or n_reviews > current[0]:
+                kept[row[key]] = (n_reviews, row)
+
+    free = []
+    for _, row in kept.values():
+        try:
+            if parse_price(row[price]) == 0:
+                free.append(row)
+        except ValueError:
+            continue
+    return free
@@ -0,0 +1,84 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+POST_TYPES = ["ask", "show", "other"]
+
+# Time zone the created_at timestamps were recorded in
+SOURCE_TZ = "America/New_York"
+CREATED_AT_FORMAT = "%m/%d/%Y %H:%M"
+
+BINS = {
+    "hour": lambda created_at: created_at.dt.hour.astype("Int8"),
+    "weekday": lambda created_at: created_at.dt.dayofweek.astype("Int8"),
+}
+
+
+def read_posts(path):
+    """Reads the Hacker News CSV keeping only the columns the aggregations need."""
+    return pd.read_csv(
+        path,
+        usecols=["title", "num_points", "num_comments", "created_at"],
+        dtype={"num_points": "int32", "num_comments": "int32"},
+    )
+
+
+def post_types(titles):
+    """Classifies every title as "ask", "show" or "other" with a vectorized prefix match."""
+    lowered = pd.Series(titles).str.lower()
+    codes = np.select(
+        [lowered.str.startswith("ask hn", na=False), lowered.str.startswith("show hn", na=False)],
+        [0, 1],
+        default=2,
+    )
+    return pd.Categorical.from_codes(codes, categories=POST_TYPES)
+
+
+def parse_created_at(created_at, tz=None):
+    """Parses "m/d/Y H:M" created_at strings in one vectorized conversion, optionally converting to tz.
+
+    Strings in any other layout or with out-of-range fields become NaT, as do local times that
+    are ambiguous or skipped around a DST change when tz is given.
+    """
+    parsed = pd.to_datetime(pd.Series(created_at), format=CREATED_AT_FORMAT, errors="coerce")
+    if tz is not None:
+        parsed = parsed.dt.tz_localize(SOURCE_TZ, ambiguous="NaT", nonexistent="NaT").dt.tz_convert(tz)
+    return parsed
+
+
+def comments_by(posts, by="hour", tz=None, include_all=False):
+    """Counts posts and averages comments per post type and time bin in one grouped pass.
+
+    Args:
+    - posts (DataFrame): posts with title, num_comments and created_at columns
+    - by (str or function): "hour", "weekday", or a function from the parsed created_at
+      Series to bin labels
+    - tz (str): time zone to bin in; None keeps the recorded local time
+    - include_all (bool): also return totals over every post under the type "all"
+
+    Returns a DataFrame indexed by (type, bin) with posts, comments and avg_comments columns.
+    Posts whose created_at does not parse (see parse_created_at) are left out with a warning;
+    their number is kept in result.attrs["unparsed"].
+    """
+    created_at = parse_created_at(posts["created_at"], tz)
+    unparsed = int(created_at.isna().sum())
+    if unparsed:
+        warnings.warn(f"{unparsed} posts left out: created_at is malformed or ambiguous around a DST change")
+    bins = BINS[by](created_at) if isinstance(by, str) else by(created_at)
+    name = by if isinstance(by, str) else "bin"
+
+    grouped = pd.DataFrame({
+        "type": post_types(posts["title"]),
+        name: bins.array,
+        "comments": posts["num_comments"].to_numpy(),
+    }).groupby(["type", name], observed=True)["comments"]
+
+    result = grouped.agg(posts="size", comments="sum")
+    if include_all:
+        totals = result.groupby(level=name).sum()
+        totals.index = pd.MultiIndex.from_product([["all"], totals.index], names=result.index.names)
+        result = pd.concat([result, totals])
+    result["avg_comments"] = result["comments"] / result["posts"]
+    result.attrs["unparsed"] = unparsed
+    return result
@@ -0,0 +1,68 @@
+"""Benchmarks aggregation.comments_by against the notebook's per-post strptime loop on a synthetic dump.
+
+Usage: python benchmark_aggregation.py [--posts 5000000]
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from aggregation import comments_by
+
+TITLES = np.array(["Ask HN: How do you learn?", "Show HN: My side project", "Interactive Dynamic Video"])
+
+
+def synthetic_posts(n_posts, seed=0):
+    rng = np.random.default_rng(seed)
+    minutes = rng.integers(0, 60 * 24 * 365 * 3, n_posts)
+    created_at = pd.Timestamp("2014-01-01") + pd.to_timedelta(minutes, unit="min")
+    return pd.DataFrame({
+        "title": TITLES[rng.integers(0, len(TITLES), n_posts)],
+        "num_points": rng.integers(0, 500, n_posts),
+        "num_comments": rng.integers(0, 100, n_posts),
+        "created_at": created_at.strftime("%-m/%-d/%Y %-H:%M"),
+    })
+
+
+def notebook_by_hour(rows):
+    """The notebook's classification and posts_and_comments_by_hour over CSV-like rows."""
+    results = {}
+    for title, comments, created_at in rows:
+        if title.lower().startswith("ask hn"):
+            post_type = "ask"
+        elif title.lower().startswith("show hn"):
+            post_type = "show"
+        else:
+            post_type = "other"
+        posts_by_hour, comments_by_hour = results.setdefault(post_type, ({}, {}))
+        hour = datetime.strptime(created_at, "%m/%d/%Y %H:%M").strftime("%H")
+        posts_by_hour[hour] = posts_by_hour.get(hour, 0) + 1
+        comments_by_hour[hour] = comments_by_hour.get(hour, 0) + comments
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    posts = synthetic_posts(args.posts)
+    rows = list(zip(posts["title"], posts["num_comments"].tolist(), posts["created_at"]))
+
+    start = time.perf_counter()
+    notebook = notebook_by_hour(rows)
+    notebook_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = comments_by(posts)
+    vectorized_seconds = time.perf_counter() - start
+
+    for post_type, (posts_by_hour, _) in notebook.items():
+        assert all(result.loc[(post_type, int(hour)), "posts"] == n for hour, n in posts_by_hour.items())
+    print(f"{args.posts:,} posts: notebook loop {notebook_seconds:.2f}s, comments_by {vectorized_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
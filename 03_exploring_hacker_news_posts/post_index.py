@@ -0,0 +1,152 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from aggregation import POST_TYPES, parse_created_at, post_types
+
+MANIFEST = "manifest.json"
+COLUMNS = ["created_at", "type", "num_comments", "num_points"]
+
+
+class PostIndex:
+    """On-disk index of Hacker News posts partitioned by month of created_at.
+
+    Each partition is an .npz file with its posts sorted by created_at (stored as minutes since
+    the epoch). A JSON manifest keeps every partition's min/max timestamp and per-type post,
+    comment and point totals, so a range query only opens the partitions it overlaps and whole
+    partitions inside the range can be summarised from the manifest alone.
+
+    Args:
+    - directory (str): where the partitions and manifest are stored; created if missing
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as opened:
+                self.manifest = json.load(opened)
+        else:
+            self.manifest = {}
+
+    def _partition_path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _load(self, key):
+        with np.load(self._partition_path(key)) as partition:
+            return {column: partition[column] for column in COLUMNS}
+
+    def _save(self, key, partition):
+        np.savez(self._partition_path(key), **partition)
+        types = partition["type"]
+        self.manifest[key] = {
+            "min": int(partition["created_at"][0]),
+            "max": int(partition["created_at"][-1]),
+            "rows": len(types),
+            "posts": np.bincount(types, minlength=len(POST_TYPES)).tolist(),
+            "comments": np.bincount(types, partition["num_comments"], len(POST_TYPES)).astype(int).tolist(),
+            "points": np.bincount(types, partition["num_points"], len(POST_TYPES)).astype(int).tolist(),
+        }
+
+    def _write_manifest(self):
+        with open(os.path.join(self.directory, MANIFEST), "w") as opened:
+            json.dump(self.manifest, opened, indent=1, sort_keys=True)
+
+    def append(self, posts):
+        """Adds posts (title, num_points, num_comments, created_at) to the index.
+
+        Only the partitions of the months the new posts fall in are rewritten. Posts whose
+        created_at does not parse are not indexed; returns how many were left out.
+        """
+        created_at = parse_created_at(posts["created_at"])
+        parsed = created_at.notna().to_numpy()
+        posts, created_at = posts[parsed], created_at[parsed]
+        new = {
+            "created_at": created_at.to_numpy().astype("datetime64[m]").astype(np.int64),
+            "type": post_types(posts["title"]).codes.astype(np.int8),
+            "num_comments": posts["num_comments"].to_numpy(dtype=np.int32),
+            "num_points": posts["num_points"].to_numpy(dtype=np.int32),
+        }
+        months = created_at.dt.strftime("%Y-%m").to_numpy()
+
+        for key in np.unique(months):
+            in_month = months == key
+            partition = {column: values[in_month] for column, values in new.items()}
+            if key in self.manifest:
+                old = self._load(key)
+                partition = {column: np.concatenate([old[column], partition[column]]) for column in COLUMNS}
+            order = np.argsort(partition["created_at"], kind="stable")
+            self._save(key, {column: values[order] for column, values in partition.items()})
+
+        self._write_manifest()
+        return int((~parsed).sum())
+
+    def _overlapping(self, start, end):
+        for key in sorted(self.manifest):
+            entry = self.manifest[key]
+            if entry["max"] >= start and entry["min"] < end:
+                yield key, entry
+
+    def query(self, start, end, post_type=None):
+        """Returns the posts created in [start, end), optionally of one type, as a DataFrame."""
+        start, end = to_minutes(start), to_minutes(end)
+        frames = []
+        for key, _ in self._overlapping(start, end):
+            partition = self._load(key)
+            lo, hi = np.searchsorted(partition["created_at"], [start, end])
+            rows = {column: values[lo:hi] for column, values in partition.items()}
+            if post_type is not None:
+                keep = rows["type"] == POST_TYPES.index(post_type)
+                rows = {column: values[keep] for column, values in rows.items()}
+            frames.append(pd.DataFrame(rows))
+
+        if not frames:
+            return pd.DataFrame({column: pd.Series(dtype="int64") for column in COLUMNS})
+        result = pd.concat(frames, ignore_index=True)
+        result["created_at"] = result["created_at"].to_numpy().astype("datetime64[m]")
+        result["type"] = pd.Categorical.from_codes(result["type"], categories=POST_TYPES)
+        return result
+
+    def comments_by_hour(self, start, end, post_type=None):
+        """Posts and mean comments per hour of day for posts created in [start, end)."""
+        posts = self.query(start, end, post_type)
+        hours = posts["created_at"].dt.hour.to_numpy() if len(posts) else np.empty(0, dtype=np.int64)
+        counts = np.bincount(hours, minlength=24)
+        comments = np.bincount(hours, posts["num_comments"].to_numpy(dtype="float64"), 24)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = comments / counts
+        return pd.DataFrame(
+            {"posts": counts, "comments": comments.astype(np.int64), "avg_comments": averages},
+            index=pd.RangeIndex(24, name="hour"),
+        )
+
+    def totals(self, start, end):
+        """Posts, comments and points per type in [start, end).
+
+        Partitions entirely inside the range are read from the manifest; only the partitions
+        cut by the range boundaries are opened.
+        """
+        start, end = to_minutes(start), to_minutes(end)
+        sums = np.zeros((3, len(POST_TYPES)), dtype=np.int64)
+        for key, entry in self._overlapping(start, end):
+            if entry["min"] >= start and entry["max"] < end:
+                sums += np.array([entry["posts"], entry["comments"], entry["points"]])
+                continue
+            partition = self._load(key)
+            lo, hi = np.searchsorted(partition["created_at"], [start, end])
+            types = partition["type"][lo:hi]
+            sums[0] += np.bincount(types, minlength=len(POST_TYPES))
+            sums[1] += np.bincount(types, partition["num_comments"][lo:hi], len(POST_TYPES)).astype(np.int64)
+            sums[2] += np.bincount(types, partition["num_points"][lo:hi], len(POST_TYPES)).astype(np.int64)
+
+        table = pd.DataFrame(sums.T, index=pd.Index(POST_TYPES, name="type"), columns=["posts", "comments", "points"])
+        table["avg_comments"] = table["comments"] / table["posts"]
+        return table
+
+
+def to_minutes(timestamp):
+    """Converts a date or timestamp (string or datetime) to minutes since the epoch."""
+    return int(np.datetime64(pd.Timestamp(timestamp).to_datetime64(), "m").astype(np.int64))
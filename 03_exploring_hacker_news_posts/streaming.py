@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from aggregation import POST_TYPES, parse_created_at, post_types
+
+HOURS = 24
+
+
+class RunningTotals:
+    """Post counts, comment sums and point sums per (post type, hour), updated one batch at a time.
+
+    Memory is a fixed (types x hours) array per metric, whatever the size of the dump. Posts
+    whose created_at does not parse are not binned; they are counted in `unparsed`.
+    """
+
+    def __init__(self):
+        n_cells = len(POST_TYPES) * HOURS
+        self.posts = np.zeros(n_cells, dtype=np.int64)
+        self.comments = np.zeros(n_cells, dtype=np.int64)
+        self.points = np.zeros(n_cells, dtype=np.int64)
+        self.unparsed = 0
+
+    def update(self, batch):
+        """Folds a batch of posts (title, num_points, num_comments, created_at) into the totals."""
+        created_at = parse_created_at(batch["created_at"])
+        parsed = created_at.notna().to_numpy()
+        self.unparsed += int((~parsed).sum())
+
+        types = post_types(batch["title"]).codes.astype(np.int64)[parsed]
+        hours = created_at[parsed].dt.hour.to_numpy(dtype=np.int64)
+        cells = types * HOURS + hours
+        n_cells = len(self.posts)
+
+        self.posts += np.bincount(cells, minlength=n_cells)
+        self.comments += np.bincount(cells, batch["num_comments"].to_numpy()[parsed], n_cells).astype(np.int64)
+        self.points += np.bincount(cells, batch["num_points"].to_numpy()[parsed], n_cells).astype(np.int64)
+
+    def table(self):
+        """Returns the totals as a DataFrame indexed by (type, hour) with mean comments and points."""
+        index = pd.MultiIndex.from_product([POST_TYPES, range(HOURS)], names=["type", "hour"])
+        table = pd.DataFrame({"posts": self.posts, "comments": self.comments, "points": self.points}, index=index)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table["avg_comments"] = table["comments"] / table["posts"]
+            table["avg_points"] = table["points"] / table["posts"]
+        return table
+
+    def by_type(self):
+        """Totals per post type over all hours."""
+        table = self.table()[["posts", "comments", "points"]].groupby(level="type", sort=False).sum()
+        table["avg_comments"] = table["comments"] / table["posts"]
+        table["avg_points"] = table["points"] / table["posts"]
+        return table
+
+
+def read_batches(path, batch_size=100_000):
+    """Yields batches of posts from a Hacker News CSV, reading only the aggregated columns."""
+    return pd.read_csv(
+        path,
+        usecols=["title", "num_points", "num_comments", "created_at"],
+        dtype={"title": "string", "num_points": "int64", "num_comments": "int64", "created_at": "string"},
+        chunksize=batch_size,
+    )
+
+
+def stream_totals(path, batch_size=100_000):
+    """Aggregates a dump of any size with memory bounded by batch_size."""
+    totals = RunningTotals()
+    for batch in read_batches(path, batch_size):
+        totals.update(batch)
+    return totals
@@ -0,0 +1,54 @@
+import pandas as pd
+
+DATE_COLUMNS = ["date_crawled", "date_created", "last_seen"]
+METRICS = ["price_dollars", "odometer_km"]
+
+
+def group_stats(autos, by=("brand",), metrics=METRICS):
+    """Mean, median and count of each metric per group, from one groupby over categorical keys.
+
+    Args:
+    - autos (DataFrame): cleaned listings, e.g. from cleaning.read_autos
+    - by (tuple): group keys, e.g. ("brand",) or ("brand", "model")
+    - metrics (list): numeric columns to summarise
+
+    Returns a DataFrame indexed by the group keys with (metric, statistic) columns.
+    """
+    keys = [autos[key] if isinstance(autos[key].dtype, pd.CategoricalDtype) else autos[key].astype("category")
+            for key in by]
+    grouped = autos[list(metrics)].groupby(keys, observed=True)
+    return grouped.agg(["mean", "median", "count"])
+
+
+def top_groups(autos, key="brand", min_share=0.05):
+    """Groups holding more than min_share of all listings, largest first."""
+    shares = autos[key].value_counts(normalize=True)
+    return shares[shares > min_share].index
+
+
+def top_brand_dashboard(autos, min_share=0.05):
+    """Per-brand price and mileage statistics for the brands above min_share of listings."""
+    stats = group_stats(autos, ("brand",))
+    return stats.loc[top_groups(autos, "brand", min_share)]
+
+
+def parse_dates(autos, columns=DATE_COLUMNS):
+    """Parses the timestamp columns to datetime64 once; columns already parsed are left as is."""
+    autos = autos.copy()
+    for column in columns:
+        if autos[column].dtype.kind != "M":
+            autos[column] = pd.to_datetime(autos[column], format="%Y-%m-%d %H:%M:%S")
+    return autos
+
+
+def date_frequencies(autos, columns=DATE_COLUMNS, freq="D"):
+    """Share of listings per day ("D") or month ("M") for each timestamp column, in date order.
+
+    Returns a DataFrame with one column per timestamp column and one row per bucket.
+    """
+    frequencies = {}
+    for column in columns:
+        dates = autos[column]
+        buckets = dates.dt.normalize() if freq == "D" else dates.dt.to_period(freq)
+        frequencies[column] = buckets.value_counts(normalize=True, dropna=False).sort_index()
+    return pd.DataFrame(frequencies)
@@ -0,0 +1,135 @@
+import re
+
+import pandas as pd
+
+ENCODING = "Latin-1"
+
+# Columns with a single value for every listing
+DROPPED = ["seller", "offerType", "nrOfPictures"]
+
+# Snake-cased names the analysis renames further
+RENAMES = {
+    "year_of_registration": "registration_year",
+    "power_p_s": "power_ps",
+    "month_of_registration": "registration_month",
+    "price": "price_dollars",
+    "odometer": "odometer_km",
+}
+
+# Raw column -> (parser, dtype of the cleaned column)
+SCHEMA = {
+    "dateCrawled": ("datetime", "datetime64[s]"),
+    "name": (None, "string"),
+    "price": ("currency", "int32"),
+    "abtest": (None, "category"),
+    "vehicleType": (None, "category"),
+    "yearOfRegistration": (None, "int16"),
+    "gearbox": (None, "category"),
+    "powerPS": (None, "int16"),
+    "model": (None, "category"),
+    "odometer": ("units", "int32"),
+    "monthOfRegistration": (None, "int8"),
+    "fuelType": (None, "category"),
+    "brand": (None, "category"),
+    "notRepairedDamage": (None, "category"),
+    "dateCreated": ("datetime", "datetime64[s]"),
+    "postalCode": (None, "int32"),
+    "lastSeen": ("datetime", "datetime64[s]"),
+}
+
+
+def snakecase(column_name):
+    """"yearOfRegistration" -> "year_of_registration", with one regex substitution."""
+    return re.sub(r"(?<!^)([A-Z])", r"_\1", column_name).lower()
+
+
+def clean_column_names(columns):
+    return [RENAMES.get(snakecase(column), snakecase(column)) for column in columns]
+
+
+def parse_currency(values):
+    """"$5,000" -> 5000"""
+    return pd.to_numeric(values.str.replace(r"[$,]", "", regex=True))
+
+
+def parse_units(values):
+    """Numbers with a unit suffix and thousands separators, e.g. "150,000km" -> 150000."""
+    return pd.to_numeric(values.str.replace(r"[^\d.\-]", "", regex=True))
+
+
+def parse_datetime(values):
+    return pd.to_datetime(values, format="%Y-%m-%d %H:%M:%S")
+
+
+PARSERS = {
+    "currency": parse_currency,
+    "units": parse_units,
+    "datetime": parse_datetime,
+}
+
+
+def memory_report(before, after):
+    """Deep memory usage of two frames in MB, and the share saved."""
+    before_mb = before.memory_usage(deep=True).sum() / 2**20
+    after_mb = after.memory_usage(deep=True).sum() / 2**20
+    return {"before_mb": before_mb, "after_mb": after_mb, "saved": 1 - after_mb / before_mb}
+
+
+def clean(autos, schema=SCHEMA):
+    """Parses every column of the raw listings with its schema parser and compact dtype.
+
+    Columns not in the schema (e.g. DROPPED) are left out; columns are renamed to the snake
+    case names used in the analysis.
+
+    Args:
+    - autos (DataFrame): listings as read from autos.csv
+    - schema (dict): raw column -> (parser name or None, dtype), see SCHEMA
+    """
+    cleaned = {}
+    for column, (parser, dtype) in schema.items():
+        if column not in autos:
+            continue
+        values = autos[column]
+        if parser is not None and not (dtype.startswith("datetime") and values.dtype.kind == "M"):
+            values = PARSERS[parser](values.astype("string"))
+        cleaned[column] = values.astype(dtype)
+
+    cleaned = pd.DataFrame(cleaned, index=autos.index)
+    cleaned.columns = clean_column_names(cleaned.columns)
+    return cleaned
+
+
+def read_dtypes(schema=SCHEMA):
+    """dtypes that read_csv can apply while parsing, so raw strings are never materialized."""
+    return {
+        column: dtype
+        for column, (parser, dtype) in schema.items()
+        if parser is None and (dtype == "category" or dtype == "string")
+    }
+
+
+def _read_csv(path, schema, encoding, **kwargs):
+    return pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=list(schema),
+        dtype=read_dtypes(schema),
+        parse_dates=[column for column, (parser, _) in schema.items() if parser == "datetime"],
+        date_format="%Y-%m-%d %H:%M:%S",
+        **kwargs,
+    )
+
+
+def read_autos(path, schema=SCHEMA, encoding=ENCODING):
+    """Reads and cleans autos.csv, pushing the column selection and category dtypes into read_csv.
+
+    Returns the cleaned listings.
+    """
+    return clean(_read_csv(path, schema, encoding), schema)
+
+
+def read_autos_chunks(path, chunksize=100_000, schema=SCHEMA, encoding=ENCODING):
+    """Yields cleaned listings chunksize rows at a time, for files too large to read at once."""
+    with _read_csv(path, schema, encoding, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield clean(chunk, schema)
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ["hour", "dayofweek", "month", "year", "weather_main", "holiday"]
+MEASURES = ["traffic_volume", "temp", "rain_1h", "snow_1h", "clouds_all"]
+
+# Slices used in the analysis, as label selections for TrafficCube.rollup(where=...)
+DAY_HOURS = range(7, 19)
+NIGHT_HOURS = [*range(0, 7), *range(19, 24)]
+WEEKDAYS = range(0, 5)  # 0 is Monday
+WEEKEND = range(5, 7)
+
+NO_HOLIDAY = "None"
+# Label of readings with no weather_main (or weather_description) recorded
+MISSING = "Missing"
+
+DTYPES = {
+    "holiday": "category",
+    "temp": "float32",
+    "rain_1h": "float32",
+    "snow_1h": "float32",
+    "clouds_all": "int8",
+    "weather_main": "category",
+    "weather_description": "category",
+    "traffic_volume": "int32",
+}
+
+
+def read_traffic(path, chunksize=None):
+    """Reads Metro_Interstate_Traffic_Volume.csv with compact dtypes and date_time parsed.
+
+    Args:
+    - path (str): path to the CSV
+    - chunksize (int): if given, returns an iterator of frames of that many rows instead
+    """
+    return pd.read_csv(
+        path,
+        dtype=DTYPES,
+        parse_dates=["date_time"],
+        date_format="%Y-%m-%d %H:%M:%S",
+        keep_default_na=False,
+        na_values=[""],
+        chunksize=chunksize,
+    )
+
+
+def calendar_keys(date_time):
+    """hour, dayofweek (0 is Monday), month and year of each timestamp as small integer arrays.
+
+    Computed with integer arithmetic on the datetime64 values, without building .dt accessors.
+    """
+    seconds = np.asarray(date_time, dtype="datetime64[s]").astype(np.int64)
+    days = seconds // 86400
+    months = np.asarray(date_time, dtype="datetime64[M]").astype(np.int64)
+    return {
+        "hour": (seconds // 3600 % 24).astype(np.int8),
+        # 1970-01-01 was a Thursday
+        "dayofweek": ((days + 3) % 7).astype(np.int8),
+        "month": (months % 12 + 1).astype(np.int8),
+        "year": (months // 12 + 1970).astype(np.int16),
+    }
+
+
+def fill_missing(values, label):
+    """values as a Categorical with missing values given their own label, so none has code -1."""
+    values = pd.Series(values).astype("category").array
+    if label not in values.categories:
+        values = values.add_categories([label])
+    return values.fillna(label)
+
+
+class TrafficCube:
+    """Sums and counts of the traffic measures per (hour, dayofweek, month, year, weather_main,
+    holiday) cell.
+
+    Only occupied cells are stored (one row per cell, with a code per dimension), so the cube
+    stays at a few thousand cells per year of history. Roll-ups over any subset of dimensions
+    sum cells with np.bincount instead of rescanning the hourly rows.
+    """
+
+    def __init__(self):
+        self.labels = {dimension: [] for dimension in DIMENSIONS}
+        self.codes = {dimension: np.empty(0, dtype=np.int16) for dimension in DIMENSIONS}
+        self.counts = np.empty(0, dtype=np.int64)
+        self.sums = {measure: np.empty(0) for measure in MEASURES}
+
+    @classmethod
+    def from_frame(cls, traffic):
+        return cls().update(traffic)
+
+    @classmethod
+    def from_csv(cls, path, chunksize=1_000_000):
+        cube = cls()
+        for chunk in read_traffic(path, chunksize):
+            cube.update(chunk)
+        return cube
+
+    def _encode(self, dimension, values):
+        """Codes of values in the dimension's labels, adding labels not seen before.
+
+        Categorical values only look up their categories; other values go through np.unique.
+        """
+        if isinstance(values, pd.Categorical):
+            if (values.codes < 0).any():
+                raise ValueError(f"{dimension} has missing values; give them a label with fill_missing()")
+            uniques, inverse = np.asarray(values.categories, dtype=object), values.codes
+        else:
+            uniques, inverse = np.unique(values, return_inverse=True)
+        labels = self.labels[dimension]
+        positions = {label: code for code, label in enumerate(labels)}
+        for label in uniques.tolist():
+            if label not in positions:
+                positions[label] = len(labels)
+                labels.append(label)
+        mapping = np.array([positions[label] for label in uniques.tolist()], dtype=np.int16)
+        return mapping[inverse.ravel()]
+
+    def update(self, traffic):
+        """Folds hourly readings (the CSV columns, date_time parsed) into the cube."""
+        keys = calendar_keys(traffic["date_time"])
+        keys["weather_main"] = fill_missing(traffic["weather_main"], MISSING)
+        keys["holiday"] = fill_missing(traffic["holiday"], NO_HOLIDAY)
+        new_codes = {dimension: self._encode(dimension, keys[dimension]) for dimension in DIMENSIONS}
+
+        codes = [np.concatenate([self.codes[dimension], new_codes[dimension]]) for dimension in DIMENSIONS]
+        shape = [len(self.labels[dimension]) for dimension in DIMENSIONS]
+        cells, first, inverse = np.unique(
+            np.ravel_multi_index(codes, shape), return_index=True, return_inverse=True
+        )
+
+        counts = np.concatenate([self.counts, np.ones(len(traffic), dtype=np.int64)])
+        self.counts = np.bincount(inverse, counts, len(cells)).astype(np.int64)
+        for measure in MEASURES:
+            values = np.concatenate([self.sums[measure], traffic[measure].to_numpy(dtype="float64")])
+            self.sums[measure] = np.bincount(inverse, values, len(cells))
+        self.codes = {dimension: code[first] for dimension, code in zip(DIMENSIONS, codes)}
+        return self
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _selected(self, where):
+        keep = np.ones(len(self), dtype=bool)
+        for dimension, wanted in (where or {}).items():
+            labels = self.labels[dimension]
+            wanted = set(wanted)
+            wanted_codes = [code for code, label in enumerate(labels) if label in wanted]
+            keep &= np.isin(self.codes[dimension], wanted_codes)
+        return keep
+
+    def rollup(self, by, where=None):
+        """Counts, sums and means of the measures per group of the `by` dimensions.
+
+        Args:
+        - by (list): dimensions to keep, e.g. ["hour"] or ["dayofweek", "hour"]; [] for a total
+        - where (dict): dimension -> labels to keep, e.g. {"hour": DAY_HOURS, "month": [7]}
+
+        Returns a DataFrame indexed by the `by` dimensions (sorted, empty groups dropped) with
+        "count", the sum of each measure as "<measure>_sum" and the mean as "<measure>".
+        """
+        keep = self._selected(where)
+        shape = [len(self.labels[dimension]) for dimension in by]
+        if by:
+            groups = np.ravel_multi_index([self.codes[dimension][keep] for dimension in by], shape)
+        else:
+            groups = np.zeros(keep.sum(), dtype=np.int64)
+        n_groups = int(np.prod(shape))
+
+        counts = np.bincount(groups, self.counts[keep], n_groups)
+        table = {"count": counts.astype(np.int64)}
+        for measure in MEASURES:
+            table[f"{measure}_sum"] = np.bincount(groups, self.sums[measure][keep], n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for measure in MEASURES:
+                table[measure] = table[f"{measure}_sum"] / counts
+
+        if by:
+            index = pd.MultiIndex.from_product([self.labels[dimension] for dimension in by], names=by)
+            if len(by) == 1:
+                index = index.get_level_values(0)
+        else:
+            index = pd.RangeIndex(1)
+        table = pd.DataFrame(table, index=index)
+        return table[table["count"] > 0].sort_index()
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from cube import MISSING, NO_HOLIDAY, calendar_keys, fill_missing
+
+TARGET = "traffic_volume"
+CATEGORICAL = ["weather_main", "weather_description", "holiday", "hour", "dayofweek", "month"]
+NUMERIC = ["temp", "rain_1h", "snow_1h", "clouds_all"]
+
+
+def encode(traffic, columns=CATEGORICAL):
+    """Dictionary-encodes the categorical indicators once.
+
+    Calendar keys (hour, dayofweek, month, year) are derived from date_time; string columns go
+    through the category dtype, with missing holidays as NO_HOLIDAY and other missing values as
+    MISSING.
+
+    Returns {column: (codes as an int16 array, labels)}.
+    """
+    calendar = calendar_keys(traffic["date_time"])
+    encoded = {}
+    for column in columns:
+        if column in calendar:
+            values = pd.Categorical(calendar[column])
+        else:
+            values = fill_missing(traffic[column], NO_HOLIDAY if column == "holiday" else MISSING)
+        encoded[column] = (values.codes.astype(np.int16), list(values.categories))
+    return encoded
+
+
+class IndicatorScorer:
+    """Scores which weather, holiday and calendar values and numeric readings predict traffic.
+
+    The frame is encoded once; every score is then a few np.bincount calls and one matrix
+    product over the selected rows.
+
+    Args:
+    - traffic (DataFrame): readings with the CSV columns, date_time parsed
+    - target (str): the column predicted
+    """
+
+    def __init__(self, traffic, target=TARGET, categorical=CATEGORICAL, numeric=NUMERIC):
+        self.encoded = encode(traffic, categorical)
+        self.numeric = list(numeric)
+        self.values = traffic[self.numeric].to_numpy(dtype="float64")
+        self.target = traffic[target].to_numpy(dtype="float64")
+        self.hours = calendar_keys(traffic["date_time"])["hour"]
+
+    def _rows(self, mask):
+        return np.ones(len(self.target), dtype=bool) if mask is None else np.asarray(mask)
+
+    def correlations(self, mask=None):
+        """Pearson correlation of each numeric column with the target, without the full matrix."""
+        rows = self._rows(mask)
+        values = self.values[rows] - self.values[rows].mean(axis=0)
+        target = self.target[rows] - self.target[rows].mean()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlations = (target @ values) / np.sqrt((values * values).sum(axis=0) * (target @ target))
+        return pd.Series(correlations, index=self.numeric, name=TARGET)
+
+    def lifts(self, mask=None, min_count=1):
+        """Per-category readings, mean target, lift over the baseline mean and correlation.
+
+        The correlation is that of the category's 0/1 membership with the target (point
+        biserial), from the same counts and sums as the mean.
+        """
+        rows = self._rows(mask)
+        target = self.target[rows]
+        n, baseline, spread = len(target), target.mean(), target.std()
+        tables = []
+        for column, (codes, labels) in self.encoded.items():
+            codes = codes[rows]
+            counts = np.bincount(codes, minlength=len(labels))
+            sums = np.bincount(codes, target, len(labels))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = sums / counts
+                share = counts / n
+                correlation = (means - baseline) * np.sqrt(share / (1 - share)) / spread
+            tables.append(pd.DataFrame({
+                "indicator": column,
+                "value": labels,
+                "readings": counts,
+                "mean": means,
+                "lift": means / baseline,
+                "correlation": correlation,
+            }))
+        table = pd.concat(tables, ignore_index=True)
+        return table[table["readings"] >= max(min_count, 1)].reset_index(drop=True)
+
+    def day(self, start=7, end=19):
+        """Mask of the readings between start (inclusive) and end (exclusive) o'clock."""
+        return (self.hours >= start) & (self.hours < end)
+
+    def rank(self, by="lift", top=10, mask=None, min_count=30, ascending=False):
+        """The top categories by "lift", "mean" or "correlation", e.g. what predicts heavy traffic."""
+        table = self.lifts(mask, min_count)
+        return table.sort_values(by, ascending=ascending, ignore_index=True).head(top)
+
+
+def report(traffic, top=10, min_count=30):
+    """What predicts heavy daytime traffic: top categories by lift and numeric correlations."""
+    scorer = IndicatorScorer(traffic)
+    day = scorer.day()
+    return {
+        "heaviest": scorer.rank("lift", top, day, min_count),
+        "lightest": scorer.rank("lift", top, day, min_count, ascending=True),
+        "correlations": scorer.correlations(day),
+    }
@@ -0,0 +1,173 @@
+import csv
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+HOURS_PER_WEEK = 7 * 24
+DAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+HEAVY_VOLUME = 5000  # cars per hour
+# Longest stretch between readings replay() waits for; the CSV has a 307-day hole in 2014-2015
+MAX_GAP = timedelta(days=1)
+
+
+class RollingWindow:
+    """Mean, standard deviation, minimum and maximum of the last `size` values.
+
+    Running sums give the mean and std; monotonic deques of (position, value) give the min and
+    max. Every push is O(1) amortized. The std is the sample std (ddof=1, NaN for a single
+    value), like pandas' rolling std and rolling_stats in the exchange rates project.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.position = 0
+        self.minima = deque()
+        self.maxima = deque()
+
+    def push(self, value):
+        self.values.append(value)
+        self.total += value
+        self.total_squares += value * value
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_squares -= old * old
+
+        while self.minima and self.minima[-1][1] >= value:
+            self.minima.pop()
+        while self.maxima and self.maxima[-1][1] <= value:
+            self.maxima.pop()
+        self.minima.append((self.position, value))
+        self.maxima.append((self.position, value))
+        oldest = self.position - self.size
+        if self.minima[0][0] <= oldest:
+            self.minima.popleft()
+        if self.maxima[0][0] <= oldest:
+            self.maxima.popleft()
+        self.position += 1
+
+    def stats(self):
+        n = len(self.values)
+        if n == 0:
+            return {"mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+        mean = self.total / n
+        std = max(self.total_squares - self.total * mean, 0.0) / (n - 1) if n > 1 else np.nan
+        return {"mean": mean, "std": std ** 0.5, "min": self.minima[0][1], "max": self.maxima[0][1]}
+
+
+class TrafficStream:
+    """Incremental traffic statistics fed one hourly reading at a time.
+
+    Keeps running counts, volume sums and heavy-traffic counts per hour of the week and per
+    weather_main, plus a rolling window over the most recent readings. update() is O(1), and
+    indicators() can be called at any moment for the current heavy traffic indicator table.
+
+    Args:
+    - window (int): number of most recent readings in the rolling statistics
+    - heavy_volume (int): traffic_volume from which an hour counts as heavy traffic
+    """
+
+    def __init__(self, window=24, heavy_volume=HEAVY_VOLUME):
+        self.heavy_volume = heavy_volume
+        self.readings = 0
+        self.volume = 0.0
+        self.hour_of_week = np.zeros((3, HOURS_PER_WEEK))  # readings, volume, heavy readings
+        self.weather = {}
+        self.rolling = RollingWindow(window)
+
+    def update(self, reading):
+        """Folds one reading (a CSV row as a dict, values as strings or numbers) into the stats.
+
+        Returns the rolling statistics after the reading.
+        """
+        date_time = reading["date_time"]
+        if isinstance(date_time, str):
+            date_time = datetime.fromisoformat(date_time)
+        volume = float(reading["traffic_volume"])
+        heavy = volume >= self.heavy_volume
+
+        self.readings += 1
+        self.volume += volume
+        cell = date_time.weekday() * 24 + date_time.hour
+        self.hour_of_week[:, cell] += (1, volume, heavy)
+        bucket = self.weather.setdefault(reading["weather_main"], [0, 0.0, 0])
+        bucket[0] += 1
+        bucket[1] += volume
+        bucket[2] += heavy
+        self.rolling.push(volume)
+        return self.rolling.stats()
+
+    def hour_of_week_means(self):
+        """Mean volume per (day of week, hour), as a 7 x 24 DataFrame (0 is Monday)."""
+        readings, volume, _ = self.hour_of_week
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = volume / readings
+        return pd.DataFrame(means.reshape(7, 24), index=pd.RangeIndex(7, name="dayofweek"),
+                            columns=pd.RangeIndex(24, name="hour"))
+
+    def weather_means(self):
+        """Mean volume per weather_main."""
+        return pd.Series({name: volume / readings for name, (readings, volume, _) in self.weather.items()},
+                         name="traffic_volume", dtype="float64").sort_index()
+
+    def indicators(self, min_readings=1):
+        """The current heavy traffic indicator table.
+
+        One row per hour of the week and per weather_main with its readings, mean volume, lift
+        (mean volume over the overall mean) and share of heavy-traffic hours, by lift.
+        """
+        readings, volume, heavy = self.hour_of_week
+        labels = [f"{DAY_NAMES[cell // 24]} {cell % 24:02d}:00" for cell in range(HOURS_PER_WEEK)]
+        table = pd.DataFrame({
+            "indicator": ["hour_of_week"] * HOURS_PER_WEEK + ["weather_main"] * len(self.weather),
+            "value": labels + list(self.weather),
+            "readings": np.concatenate([readings, [bucket[0] for bucket in self.weather.values()]]),
+            "volume": np.concatenate([volume, [bucket[1] for bucket in self.weather.values()]]),
+            "heavy": np.concatenate([heavy, [bucket[2] for bucket in self.weather.values()]]),
+        })
+        table = table[table["readings"] >= max(min_readings, 1)]
+        table = table.assign(
+            mean_volume=table["volume"] / table["readings"],
+            heavy_share=table["heavy"] / table["readings"],
+        )
+        # Before the first reading the table is empty, and so is the lift column
+        table["lift"] = table["mean_volume"] / (self.volume / self.readings) if self.readings else np.nan
+        table["readings"] = table["readings"].astype(np.int64)
+        columns = ["indicator", "value", "readings", "mean_volume", "lift", "heavy_share"]
+        return table[columns].sort_values("lift", ascending=False, ignore_index=True)
+
+
+def replay(path, speedup=None, max_gap=MAX_GAP):
+    """Yields the rows of a traffic CSV as readings, optionally paced like a live feed.
+
+    Args:
+    - path (str): e.g. "Metro_Interstate_Traffic_Volume.csv"
+    - speedup (float): if given, sleeps the time between consecutive date_time values divided
+      by speedup, e.g. 3600 replays an hour of readings per second
+    - max_gap (timedelta): longer gaps between readings are replayed as max_gap, so missing
+      stretches of data do not stall the feed; None replays every gap in full
+    """
+    previous = None
+    with open(path, newline="") as opened:
+        for reading in csv.DictReader(opened):
+            if speedup:
+                current = datetime.fromisoformat(reading["date_time"])
+                if previous is not None and current > previous:
+                    gap = current - previous if max_gap is None else min(current - previous, max_gap)
+                    time.sleep(gap.total_seconds() / speedup)
+                previous = current
+            yield reading
+
+
+def stream(path, window=24, speedup=None, max_gap=MAX_GAP):
+    """Replays a CSV through a TrafficStream and returns it."""
+    traffic = TrafficStream(window)
+    for reading in replay(path, speedup, max_gap):
+        traffic.update(reading)
+    return traffic
@@ -0,0 +1,104 @@
+import os
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+MISSING = "-"
+
+
+def currency_name(column):
+    """"[US dollar ]" -> "us_dollar", and the date column "Period\\Unit:" -> "date"."""
+    if column.startswith("Period"):
+        return "date"
+    return re.sub(r"\s+", "_", column.strip("[] ").strip()).lower()
+
+
+@dataclass
+class Rates:
+    """Daily euro reference rates: one row per date (ascending), one column per currency.
+
+    values is a single C-ordered float32 array, NaN where the ECB published no rate.
+    """
+
+    dates: np.ndarray  # datetime64[D]
+    currencies: list
+    values: np.ndarray  # float32, (dates, currencies)
+
+    def frame(self):
+        """The rates as a DataFrame over a sorted DatetimeIndex, sharing memory with values."""
+        return pd.DataFrame(self.values, index=pd.DatetimeIndex(self.dates, name="date"),
+                            columns=self.currencies, copy=False)
+
+    def long(self):
+        """(date, currency, rate) view of the rates, see LongRates."""
+        return LongRates(self)
+
+    def __getitem__(self, currency):
+        """The rates of one currency, as a view on values."""
+        return self.values[:, self.currencies.index(currency)]
+
+
+class LongRates:
+    """Long (date, currency, rate) view over Rates without copying them.
+
+    rate is values.ravel() (a view, since values is C-ordered); date and currency are
+    zero-stride broadcasts with the same shape as values, so row i of the long table is
+    (date.flat[i], currency.flat[i], rate[i]). frame() materializes it when needed.
+    """
+
+    def __init__(self, rates):
+        self.rates = rates
+        shape = rates.values.shape
+        self.rate = rates.values.ravel()
+        self.date = np.broadcast_to(rates.dates[:, None], shape)
+        self.codes = np.broadcast_to(np.arange(shape[1], dtype=np.int8), shape)
+
+    def __len__(self):
+        return len(self.rate)
+
+    def frame(self, dropna=True):
+        """Materializes the long table, currency as a categorical, dropping missing rates."""
+        keep = ~np.isnan(self.rate) if dropna else slice(None)
+        return pd.DataFrame({
+            "date": self.date.ravel()[keep],
+            "currency": pd.Categorical.from_codes(self.codes.ravel()[keep], categories=self.rates.currencies),
+            "rate": self.rate[keep],
+        })
+
+
+def read_rates(path):
+    """Parses the ECB CSV: every currency straight to float32 with "-" as NaN, sorted by date."""
+    header = pd.read_csv(path, nrows=0).columns
+    rates = pd.read_csv(
+        path,
+        index_col=0,
+        parse_dates=[0],
+        date_format="%Y-%m-%d",
+        na_values=[MISSING],
+        dtype={column: np.float32 for column in header[1:]},
+    ).sort_index()
+    return Rates(
+        dates=rates.index.to_numpy().astype("datetime64[D]"),
+        currencies=[currency_name(column) for column in header[1:]],
+        values=np.ascontiguousarray(rates.to_numpy(dtype=np.float32)),
+    )
+
+
+def load_rates(path, cache=None):
+    """Reads the rates from a binary .npz cache, reparsing the CSV when the cache is older.
+
+    Args:
+    - path (str): e.g. "euro-daily-hist_1999_2020.csv"
+    - cache (str): cache file; path with ".npz" appended if None
+    """
+    cache = cache or path + ".npz"
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        with np.load(cache) as cached:
+            return Rates(cached["dates"], cached["currencies"].tolist(), cached["values"])
+
+    rates = read_rates(path)
+    with open(cache, "wb") as opened:
+        np.savez(opened, dates=rates.dates, currencies=np.array(rates.currencies), values=rates.values)
+    return rates
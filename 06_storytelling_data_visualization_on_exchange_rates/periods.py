@@ -0,0 +1,191 @@
+import os
+import warnings
+from dataclasses import dataclass
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from rendering import hide_spines, map_with_arrays, save_figure
+from rolling import RollingRates
+
+
+@dataclass(frozen=True)
+class Period:
+    """A named date range, start inclusive and end exclusive, e.g. a presidency."""
+    name: str
+    start: str
+    end: str
+    color: str = None
+
+
+PRESIDENTS = (
+    Period("Bush", "2001-01-20", "2009-01-20", "#BF5FFF"),
+    Period("Obama", "2009-01-20", "2017-01-20", "#ffa500"),
+    Period("Trump", "2017-01-20", "2021-01-20", "#00B2EE"),
+)
+
+
+def period_rows(dates, periods):
+    """Row slice of each period in the sorted dates, with two binary searches per period."""
+    bounds = np.array([(period.start, period.end) for period in periods], dtype="datetime64[D]")
+    starts, ends = np.searchsorted(dates, bounds[:, 0]), np.searchsorted(dates, bounds[:, 1])
+    return [slice(start, end) for start, end in zip(starts, ends)]
+
+
+def _first_valid(block):
+    """First non-NaN value of each column, NaN for columns without one."""
+    return block[np.argmax(~np.isnan(block), axis=0), np.arange(block.shape[1])]
+
+
+def summarize(dates, values, periods, columns=None):
+    """Summary statistics of every column of values over each period.
+
+    Args:
+    - dates (ndarray): sorted datetime64 dates, one per row of values
+    - values (ndarray): (dates,) or (dates, columns) rates; NaNs are skipped
+    - periods (list): Period objects
+    - columns (list): column names for 2-D values, e.g. the currencies
+
+    Returns a DataFrame indexed by (column, period), or by period for 1-D values, with days,
+    mean, std, min, max, first, last and change (last / first - 1).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    one_column = values.ndim == 1
+    values = values[:, None] if one_column else values
+    columns = [None] if one_column else list(columns)
+
+    tables = []
+    for period, rows in zip(periods, period_rows(dates, periods)):
+        # An empty period is one row of NaN, so every statistic is NaN and days is 0
+        block = values[rows] if rows.stop > rows.start else np.full((1, values.shape[1]), np.nan)
+        with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stats = {
+                "days": (~np.isnan(block)).sum(axis=0),
+                "mean": np.nanmean(block, axis=0),
+                "std": np.nanstd(block, axis=0, ddof=1),
+                "min": np.nanmin(block, axis=0),
+                "max": np.nanmax(block, axis=0),
+                "first": _first_valid(block),
+                "last": _first_valid(block[::-1]),
+            }
+            stats["change"] = stats["last"] / stats["first"] - 1
+        table = pd.DataFrame(stats, index=columns)
+        table["period"] = period.name
+        tables.append(table)
+
+    summary = pd.concat(tables)
+    if one_column:
+        return summary.set_index("period")
+    summary.index.name = "column"
+    return summary.set_index("period", append=True).sort_index(level=0, sort_remaining=False)
+
+
+def _date_axis(ax, start, end):
+    """Year ticks spaced from the span shown, so about four labels fit any period."""
+    years = (end - start) / np.timedelta64(365, "D")
+    ax.xaxis.set_major_locator(mdates.YearLocator(base=max(1, int(np.ceil(years / 4)))))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
+    ax.set_xlim(start, end)
+
+
+def draw_comparison(fig, dates, values, periods, label, summary=None):
+    """Draws one subplot per period over a full-width subplot of all periods.
+
+    Tick positions, y limits and label placement are derived from the data and the periods, in
+    axes coordinates, rather than from fixed offsets.
+
+    Args:
+    - fig (Figure): figure drawn on
+    - dates (ndarray): sorted datetime64 dates
+    - values (ndarray): rate series plotted, e.g. a rolling mean
+    - periods (list): Period objects
+    - label (str): what is plotted, e.g. "EUR-USD"
+    - summary (DataFrame): summarize() of values over periods; computed if None
+    """
+    summary = summarize(dates, values, periods) if summary is None else summary
+    rows = period_rows(dates, periods)
+    shown = np.concatenate([values[row] for row in rows])
+    shown = shown[~np.isnan(shown)]
+    low, high = (shown.min(), shown.max()) if len(shown) else (0.0, 1.0)
+    pad = (high - low) * 0.1 or abs(high) * 0.05 or 1
+    ylim = (low - pad, high + pad)
+
+    grid = fig.add_gridspec(2, len(periods), hspace=0.45)
+    overview = fig.add_subplot(grid[1, :])
+    axes = [fig.add_subplot(grid[0, i]) for i in range(len(periods))]
+    for ax in axes + [overview]:
+        hide_spines(ax)
+        ax.tick_params(left=0, bottom=0)
+        ax.grid(alpha=0.5)
+        ax.set_ylim(*ylim)
+
+    for i, (ax, period, row) in enumerate(zip(axes, periods, rows)):
+        start, end = np.datetime64(period.start, "D"), np.datetime64(period.end, "D")
+        ax.plot(dates[row], values[row], color=period.color)
+        overview.plot(dates[row], values[row], color=period.color)
+        _date_axis(ax, start, end)
+        if i:
+            ax.set_yticklabels([])
+        ax.text(0.5, 1.2, period.name.upper(), transform=ax.transAxes, ha="center",
+                fontsize=16, weight="bold", color=period.color)
+        ax.text(0.5, 1.06, f"({start.astype(object).year}-{end.astype(object).year})",
+                transform=ax.transAxes, ha="center", weight="bold", alpha=0.3)
+
+    overall_start = np.datetime64(min(period.start for period in periods), "D")
+    overall_end = np.datetime64(max(period.end for period in periods), "D")
+    _date_axis(overview, overall_start, overall_end)
+
+    means = ", ".join(f"{period.name} {summary.loc[period.name, 'mean']:.2f}" for period in periods)
+    average = shown.mean() if len(shown) else np.nan
+    fig.suptitle(f"{label} rate averaged {average:.2f} over these periods", y=1.1, fontsize=16, weight="bold")
+    fig.text(0.5, 1.03, f"Average by period: {means}", ha="center", alpha=0.6)
+    fig.text(0.01, 0.01, "Source: European Central Bank", alpha=0.5)
+    return axes + [overview]
+
+
+def render_comparison(name, dates, values, periods, label, out_dir, formats=("png",), figsize=(12, 6)):
+    """Renders one comparison figure with the Agg backend and returns the written paths."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw_comparison(fig, dates, values, periods, label)
+    return save_figure(fig, name, out_dir, formats)
+
+
+def _render(arrays, currency, column, periods, out_dir, formats):
+    label = f"EUR-{currency.replace('_', ' ').upper()}"
+    return render_comparison(currency, arrays["dates"], arrays["means"][:, column], periods, label, out_dir, formats)
+
+
+def compare_periods(rates, periods=PRESIDENTS, out_dir="periods", currencies=None, window=30,
+                    formats=("png",), processes=None):
+    """Summarizes and renders the period comparison of every currency against the euro.
+
+    The rolling means of all currencies come from one RollingRates pass; the figures, one per
+    currency, are spread across a process pool that maps the means from shared memory (see
+    rendering.map_with_arrays).
+
+    Args:
+    - rates (loading.Rates): daily rates
+    - periods (list): Period objects, e.g. PRESIDENTS
+    - out_dir (str): directory the figures are written to
+    - currencies (list): currencies to report; all if None
+    - window (int): rolling mean window plotted, in rows
+    - formats (tuple): image formats to write
+    - processes (int): number of worker processes; 1 renders in the current process
+
+    Returns (summary of the daily rates indexed by (currency, period), {currency: paths}).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    currencies = list(rates.currencies) if currencies is None else list(currencies)
+    summary = summarize(rates.dates, rates.values, periods, rates.currencies).loc[currencies]
+
+    rolling = RollingRates(rates, (window,), min_periods=window // 2)
+    arrays = {"dates": rolling.dates, "means": rolling.stat("mean", window)}
+    columns = list(rates.currencies)
+    tasks = [(currency, columns.index(currency), periods, out_dir, formats) for currency in currencies]
+    paths = map_with_arrays(_render, arrays, tasks, processes)
+    return summary, dict(zip(currencies, paths))
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+STATISTICS = ["mean", "std", "min", "max"]
+
+
+def _window_sums(values, window):
+    sums = np.cumsum(values, axis=0)
+    sums[window:] -= sums[:-window].copy()
+    return sums
+
+
+def _window_extremes(values, window, start):
+    """Rolling min and max of rows start onwards, with one vectorized fmin/fmax per offset."""
+    padded = np.concatenate([np.full((window - 1, values.shape[1]), np.nan, values.dtype), values])
+    rows = len(values) - start
+    minimum = padded[start:start + rows].copy()
+    maximum = minimum.copy()
+    for offset in range(1, window):
+        # fmin/fmax ignore NaN unless the whole window is missing
+        np.fmin(minimum, padded[start + offset:start + offset + rows], out=minimum)
+        np.fmax(maximum, padded[start + offset:start + offset + rows], out=maximum)
+    return minimum, maximum
+
+
+def rolling_stats(values, window, min_periods=1, start=0):
+    """Rolling mean, std (ddof=1), min and max over the rows of a (dates, currencies) array.
+
+    Every currency is computed at once. Missing rates (NaN) are skipped; a window with fewer
+    than min_periods rates gives NaN.
+
+    Args:
+    - values (ndarray): (dates, currencies) rates
+    - window (int): window length in rows
+    - min_periods (int): fewest rates in a window for a value
+    - start (int): first row to return; earlier rows only feed the windows
+
+    Returns {statistic: float32 array of the rows from start}.
+    """
+    present = ~np.isnan(values)
+    # Sums of deviations from a per-currency reference keep the squares small, so the
+    # variance of flat (pegged) currencies stays exactly zero
+    first = present.argmax(axis=0)
+    reference = np.nan_to_num(values[first, np.arange(values.shape[1])]).astype(np.float64)
+    filled = np.where(present, values - reference, 0).astype(np.float64)
+    counts = _window_sums(present.astype(np.float64), window)
+    sums = _window_sums(filled, window)
+    squares = _window_sums(filled * filled, window)
+
+    counts, sums, squares = counts[start:], sums[start:], squares[start:]
+    minimum, maximum = _window_extremes(values, window, start)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = sums / counts
+        variance = np.maximum(squares - sums * mean, 0) / (counts - 1)
+        stats = {
+            "mean": mean + reference,
+            "std": np.where(counts > 1, np.sqrt(variance), np.nan),
+            "min": minimum,
+            "max": maximum,
+        }
+    enough = counts >= max(min_periods, 1)
+    return {name: np.where(enough, stat, np.nan).astype(np.float32) for name, stat in stats.items()}
+
+
+class RollingRates:
+    """Rolling statistics of every currency for several windows, kept up to date as rows arrive.
+
+    Rates and statistics live in preallocated buffers that grow by doubling, and append() only
+    computes the statistics of the new rows, from them and the window - 1 rows before them.
+    Queries slice the buffers and so return views.
+
+    Args:
+    - rates (loading.Rates): initial rates
+    - windows (tuple): window lengths in rows (ECB publication days)
+    - min_periods (int): see rolling_stats
+    """
+
+    def __init__(self, rates, windows=(30,), min_periods=1):
+        self.currencies = list(rates.currencies)
+        self.windows = tuple(windows)
+        self.min_periods = min_periods
+        self.size = 0
+        self._dates = np.empty(0, dtype="datetime64[D]")
+        self._values = np.empty((0, len(self.currencies)), dtype=np.float32)
+        self._stats = {(window, name): self._values.copy() for window in self.windows for name in STATISTICS}
+        self.append(rates)
+
+    def _reserve(self, size):
+        if size <= len(self._dates):
+            return
+        capacity = max(size, 2 * len(self._dates))
+
+        def grow(buffer, fill):
+            grown = np.full((capacity, *buffer.shape[1:]), fill, dtype=buffer.dtype)
+            grown[:self.size] = buffer[:self.size]
+            return grown
+
+        self._dates = grow(self._dates, np.datetime64("NaT"))
+        self._values = grow(self._values, np.nan)
+        self._stats = {key: grow(buffer, np.nan) for key, buffer in self._stats.items()}
+
+    def append(self, rates):
+        """Adds rows dated after the last one and computes their statistics only."""
+        if self.size and len(rates.dates) and rates.dates[0] <= self._dates[self.size - 1]:
+            raise ValueError("appended rates must be dated after the last row")
+        if list(rates.currencies) != self.currencies:
+            raise ValueError("appended rates must have the same currencies")
+
+        start, end = self.size, self.size + len(rates.dates)
+        self._reserve(end)
+        self._dates[start:end] = rates.dates
+        self._values[start:end] = rates.values
+        for window in self.windows:
+            tail = max(start - (window - 1), 0)
+            stats = rolling_stats(self._values[tail:end], window, self.min_periods, start - tail)
+            for name, stat in stats.items():
+                self._stats[window, name][start:end] = stat
+        self.size = end
+
+    @property
+    def dates(self):
+        return self._dates[:self.size]
+
+    @property
+    def values(self):
+        return self._values[:self.size]
+
+    def _rows(self, start, end):
+        """Row slice of the dates in [start, end], found by binary search; None is unbounded."""
+        dates = self.dates
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(start, "D"), side="left")
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(end, "D"), side="right")
+        return slice(lo, hi)
+
+    def stat(self, name, window=None, start=None, end=None, currency=None):
+        """One statistic between two dates (inclusive) as a view on the buffers.
+
+        Args:
+        - name (str): one of STATISTICS
+        - window (int): one of the windows; the first if None
+        - start, end (str or datetime): date bounds, None for unbounded
+        - currency (str): a single currency's column; all currencies if None
+        """
+        stat = self._stats[window or self.windows[0], name][self._rows(start, end)]
+        return stat if currency is None else stat[:, self.currencies.index(currency)]
+
+    def frame(self, name, window=None, start=None, end=None):
+        """stat() as a DataFrame indexed by date, sharing memory with the buffers."""
+        rows = self._rows(start, end)
+        return pd.DataFrame(self.stat(name, window, start, end), columns=self.currencies, copy=False,
+                            index=pd.DatetimeIndex(self.dates[rows], name="date"))
@@ -0,0 +1,216 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Canonical column -> dtype of the merged frame (None keeps the dtype each source reads)
+CANONICAL = {
+    "id": "float64",
+    "institute": "category",
+    "separationtype": "category",
+    "cease_date": "string",
+    "dete_start_date": "float64",
+    "role_start_date": "float64",
+    "position": "category",
+    "classification": "category",
+    "region": "category",
+    "business_unit": "category",
+    "employment_status": "category",
+    "career_move_to_public_sector": None,
+    "career_move_to_private_sector": None,
+    "career_move_to_self_employment": None,
+    "interpersonal_conflicts": None,
+    "job_dissatisfaction": None,
+    "dissatisfaction": None,
+    "dissatisfaction_with_the_department": None,
+    "physical_work_environment": None,
+    "lack_of_recognition": None,
+    "lack_of_job_security": None,
+    "work_location": None,
+    "employment_conditions": None,
+    "maternity/family": None,
+    "relocation": None,
+    "study/travel": None,
+    "study": None,
+    "travel": None,
+    "ill_health": None,
+    "traumatic_incident": None,
+    "work_life_balance": None,
+    "workload": None,
+    "other": None,
+    "no_factor_provided": None,
+    "gender": "category",
+    "age": "category",
+    "length_service": "category",
+    "length_service_current": "category",
+}
+
+
+@dataclass(frozen=True)
+class SourceSchema:
+    """How one survey export maps onto the CANONICAL columns.
+
+    Args:
+    - name (str): value of the canonical "institute" column for this source, e.g. "DETE"
+    - path (str): CSV file
+    - columns (dict): raw column -> canonical column; only these columns are read
+    - dtypes (dict): raw column -> dtype pushed into read_csv
+    - na_values (tuple): strings read as missing
+    - strip (dict): canonical column -> regex removed from its values, e.g. reason suffixes
+    """
+    name: str
+    path: str
+    columns: dict
+    dtypes: dict = field(default_factory=dict)
+    na_values: tuple = ()
+    strip: dict = field(default_factory=dict)
+
+
+def snakecase(column):
+    """"Career move to public sector" -> "career_move_to_public_sector"."""
+    return column.strip().lower().replace(" ", "_")
+
+
+DETE_FACTORS = [
+    "Career move to public sector", "Career move to private sector", "Interpersonal conflicts",
+    "Job dissatisfaction", "Dissatisfaction with the department", "Physical work environment",
+    "Lack of recognition", "Lack of job security", "Work location", "Employment conditions",
+    "Maternity/family", "Relocation", "Study/Travel", "Ill Health", "Traumatic incident",
+    "Work life balance", "Workload",
+]
+
+DETE = SourceSchema(
+    name="DETE",
+    path=os.path.join(HERE, "dete_survey.csv"),
+    columns={
+        "ID": "id",
+        "SeparationType": "separationtype",
+        "Cease Date": "cease_date",
+        "DETE Start Date": "dete_start_date",
+        "Role Start Date": "role_start_date",
+        "Position": "position",
+        "Classification": "classification",
+        "Region": "region",
+        "Business Unit": "business_unit",
+        "Employment Status": "employment_status",
+        **{factor: snakecase(factor) for factor in DETE_FACTORS},
+        "None of the above": "no_factor_provided",
+        "Gender": "gender",
+        "Age": "age",
+    },
+    dtypes={
+        "Cease Date": "string",
+        "DETE Start Date": "float64",
+        "Role Start Date": "float64",
+        **{factor: "boolean" for factor in DETE_FACTORS + ["None of the above"]},
+        **{column: "category" for column in ["SeparationType", "Position", "Classification", "Region",
+                                            "Business Unit", "Employment Status", "Gender", "Age"]},
+    },
+    na_values=("Not Stated",),
+    strip={"separationtype": r"-Other reasons|-Other employer|-Move overseas/interstate"},
+)
+
+TAFE_FACTORS = {
+    "Contributing Factors. Career Move - Public Sector ": "career_move_to_public_sector",
+    "Contributing Factors. Career Move - Private Sector ": "career_move_to_private_sector",
+    "Contributing Factors. Career Move - Self-employment": "career_move_to_self_employment",
+    "Contributing Factors. Ill Health": "ill_health",
+    "Contributing Factors. Maternity/Family": "maternity/family",
+    "Contributing Factors. Dissatisfaction": "dissatisfaction",
+    "Contributing Factors. Job Dissatisfaction": "job_dissatisfaction",
+    "Contributing Factors. Interpersonal Conflict": "interpersonal_conflicts",
+    "Contributing Factors. Study": "study",
+    "Contributing Factors. Travel": "travel",
+    "Contributing Factors. Other": "other",
+    "Contributing Factors. NONE": "no_factor_provided",
+}
+
+TAFE = SourceSchema(
+    name="TAFE",
+    path=os.path.join(HERE, "tafe_survey.csv"),
+    columns={
+        "Record ID": "id",
+        "Reason for ceasing employment": "separationtype",
+        "CESSATION YEAR": "cease_date",
+        **TAFE_FACTORS,
+        "Gender. What is your Gender?": "gender",
+        "CurrentAge. Current Age": "age",
+        "Employment Type. Employment Type": "employment_status",
+        "Classification. Classification": "classification",
+        "LengthofServiceOverall. Overall Length of Service at Institute (in years)": "length_service",
+        "LengthofServiceCurrent. Length of Service at current workplace (in years)": "length_service_current",
+    },
+    dtypes={
+        "Record ID": "float64",
+        "CESSATION YEAR": "string",
+        **{column: "category" for column in TAFE_FACTORS},
+        **{column: "category" for column in ["Reason for ceasing employment", "Gender. What is your Gender?",
+                                            "CurrentAge. Current Age", "Employment Type. Employment Type",
+                                            "Classification. Classification"]},
+    },
+)
+
+SOURCES = [DETE, TAFE]
+
+
+def canonicalize(frame, source):
+    """Renames a chunk of a source to canonical columns and applies its value clean-up."""
+    frame = frame.rename(columns=source.columns)
+    for column, pattern in source.strip.items():
+        stripped = frame[column].astype("string").str.replace(pattern, "", regex=True)
+        is_category = isinstance(frame[column].dtype, pd.CategoricalDtype)
+        frame[column] = stripped.astype("category") if is_category else stripped
+    frame.insert(0, "institute", source.name)
+    return frame
+
+
+def read_source(source, chunksize=None, where=None):
+    """Reads one source in a single pass, only its mapped columns and with its dtypes.
+
+    Args:
+    - source (SourceSchema): what to read
+    - chunksize (int): rows parsed at a time; None reads the file at once
+    - where (function): canonical chunk -> boolean mask of the rows kept, applied per chunk so
+      dropped rows are never accumulated
+
+    Returns the kept rows with canonical column names.
+    """
+    reader = pd.read_csv(
+        source.path,
+        usecols=list(source.columns),
+        dtype=source.dtypes,
+        na_values=list(source.na_values),
+        chunksize=chunksize,
+    )
+    chunks = reader if chunksize else [reader]
+    kept = []
+    for chunk in chunks:
+        chunk = canonicalize(chunk, source)
+        kept.append(chunk[where(chunk)] if where else chunk)
+    return pd.concat(kept, ignore_index=True) if len(kept) > 1 else kept[0]
+
+
+def conform(frame, canonical=CANONICAL):
+    """Adds missing canonical columns as NA and casts to the canonical dtypes."""
+    frame = frame.reindex(columns=list(canonical))
+    return frame.astype({column: dtype for column, dtype in canonical.items() if dtype is not None})
+
+
+def harmonize(sources=SOURCES, chunksize=None, where=None, workers=None):
+    """Loads every source concurrently and merges them into one canonical frame.
+
+    Args:
+    - sources (list): SourceSchema objects; add one to bring in another export
+    - chunksize, where: see read_source; e.g. where=lambda chunk: chunk["separationtype"] == "Resignation"
+    - workers (int): sources read at once; each holds at most one chunk in flight
+
+    Returns a frame with the CANONICAL columns, "institute" telling the sources apart.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(lambda source: read_source(source, chunksize, where), sources))
+    merged = pd.concat([conform(frame) for frame in frames], ignore_index=True)
+    # Categories differ between sources, so concat falls back to object columns
+    return conform(merged)
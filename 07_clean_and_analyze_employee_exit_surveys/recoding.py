@@ -0,0 +1,126 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from harmonize import CANONICAL
+
+NOT_A_FACTOR = "-"
+FACTORS = [column for column, dtype in CANONICAL.items() if dtype is None]
+DISSATISFACTION = [
+    "dissatisfaction", "job_dissatisfaction", "dissatisfaction_with_the_department", "physical_work_environment",
+    "lack_of_recognition", "lack_of_job_security", "work_location", "employment_conditions", "work_life_balance",
+    "workload",
+]
+
+# Normalized age string ("36-40") -> age band
+AGE_BANDS = {
+    "20 or younger": "20 or younger",
+    "21-25": "20-30",
+    "26-30": "20-30",
+    "31-35": "30-40",
+    "36-40": "30-40",
+    "41-45": "40-50",
+    "46-50": "40-50",
+    "51-55": "51-55",
+    "56-60": "56 or older",
+    "56 or older": "56 or older",
+    "61 or older": "56 or older",
+}
+BANDS = pd.CategoricalDtype(["20 or younger", "20-30", "30-40", "40-50", "51-55", "56 or older"], ordered=True)
+
+# "36  40" (TAFE) and "36-40" (DETE) are the same range
+AGE_RANGE = re.compile(r"^(\d+)\s*(?:-|\s)\s*(\d+)$")
+# The year at the end of "08/2012", "2012" or "2012.0"
+YEAR = re.compile(r"(\d{4})(?:\.0+)?$")
+
+
+def _categorical(values):
+    """values as a Categorical, so per-value work is done once per distinct value."""
+    values = pd.Series(values)
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    return values.array
+
+
+def factor_flags(values):
+    """Sentinel-coded contributing factor -> nullable boolean.
+
+    "-" is False, missing is NA and any other text (the factor's name) is True. Booleans
+    (DETE) keep their value. The flag is worked out per category, then taken by code.
+    """
+    values = pd.Series(values)
+    if values.dtype.kind == "b" or values.dtype == "boolean":
+        return values.astype("boolean")
+    categorical = _categorical(values)
+    # Missing values have code -1, which picks the appended placeholder
+    flags = [category not in (NOT_A_FACTOR, False) for category in categorical.categories]
+    flags = np.array(flags + [False], dtype=bool)
+    codes = categorical.codes
+    return pd.Series(pd.arrays.BooleanArray(flags[codes], codes < 0), index=values.index, name=values.name)
+
+
+def recode_factors(frame, columns):
+    """Returns frame with each of the factor columns as nullable booleans."""
+    return frame.assign(**{column: factor_flags(frame[column]) for column in columns})
+
+
+def any_factor(frame, columns):
+    """Row-wise OR of nullable boolean factor columns with Kleene logic.
+
+    True if any factor is True, NA if none is True but one is missing, else False.
+    """
+    flags = [frame[column].astype("boolean").array for column in columns]
+    values = np.column_stack([flag.to_numpy(dtype=bool, na_value=False) for flag in flags])
+    missing = np.column_stack([flag.isna() for flag in flags])
+    result = values.any(axis=1)
+    return pd.Series(pd.arrays.BooleanArray(result, ~result & missing.any(axis=1)), index=frame.index)
+
+
+def normalize_age(age):
+    """"36  40" -> "36-40"; other strings are stripped."""
+    return AGE_RANGE.sub(r"\1-\2", age.strip())
+
+
+def age_bands(values):
+    """Age strings of either survey -> ordered BANDS categorical, through one lookup table.
+
+    Only the distinct ages are normalized; unknown ages become NA.
+    """
+    values = pd.Series(values)
+    categorical = _categorical(values)
+    lookup = pd.Categorical([AGE_BANDS.get(normalize_age(age)) for age in categorical.categories], dtype=BANDS)
+    codes = np.append(lookup.codes, -1)[categorical.codes]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=BANDS), index=values.index, name=values.name)
+
+
+def extract_years(values):
+    """Year of "08/2012"-style dates, "2012" or "2012.0" as Int16, with one compiled regex.
+
+    The regex runs once per distinct value.
+    """
+    values = pd.Series(values)
+    categorical = _categorical(values.astype("string"))
+    years = [YEAR.search(value) for value in categorical.categories]
+    lookup = pd.array([int(match.group(1)) if match else pd.NA for match in years] + [pd.NA], dtype="Int16")
+    return pd.Series(lookup[categorical.codes], index=values.index, name=values.name)
+
+
+def recode(survey):
+    """Recodes a harmonize() frame: factors to nullable booleans, age to BANDS, cease_date to
+    the year, plus the "dissatisfied" summary factor.
+
+    "dissatisfied" combines, per institute, only the DISSATISFACTION columns that institute's
+    survey asks.
+    """
+    survey = recode_factors(survey, FACTORS)
+    dissatisfied = pd.Series(pd.NA, index=survey.index, dtype="boolean")
+    for rows in survey.groupby("institute", observed=True).indices.values():
+        part = survey.iloc[rows]
+        asked = [column for column in DISSATISFACTION if part[column].notna().any()]
+        dissatisfied.iloc[rows] = any_factor(part, asked).array
+    return survey.assign(
+        age=age_bands(survey["age"]),
+        cease_date=extract_years(survey["cease_date"]),
+        dissatisfied=dissatisfied,
+    )
@@ -6,6 +6,8 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import warnings
 from IPython import display
+from correlation import TargetCorrelation
+from panels import PANELS, column_arrays, draw_panel, render_panels
 
 # %matplotlib inline
 warnings.filterwarnings("ignore")
@@ -140,16 +142,19 @@ def get_first_two_chars(dbn):
 
 combined["school_dist"] = combined["DBN"].apply(get_first_two_chars)
 
-# Define function to remove edges of visual charts
-def remove_spines():
-    for ax in axes:
-        for spine in spines:
-            ax.spines[spine].set_visible(False)
-            ax.tick_params(left=0, bottom=0)
-            ax.grid(alpha=0.5)
+# Scatter panels vs. SAT score, declared in panels.PANELS
+panels = PANELS
+
+panel_arrays = column_arrays(combined, panels.values())
+
+def show_panel(key):
+    spec = panels[key]
+    fig = plt.figure(figsize=spec.figsize)
+    draw_panel(fig, spec, panel_arrays)
+    plt.show()
 
 # Find correlations to SAT score
-sat_score_corr = combined.corr(numeric_only=True)["sat_score"]
+sat_score_corr = TargetCorrelation(combined, "sat_score").correlations()
 print(sat_score_corr)
 
 # Plot survey correlations
@@ -163,48 +168,10 @@ plt.show()
 print(round(combined["sat_score"].mean(numeric_only=True)))
 
 # Number of respondents vs. SAT score
-fig, (ax1, ax2, ax3) = plt.subplots(1,3, figsize=(9,3))
-fig.suptitle("Number of respondents vs. SAT score")
-ax1.scatter(combined["N_s"], combined["sat_score"])
-ax2.scatter(combined["N_p"], combined["sat_score"])
-ax3.scatter(combined["N_t"], combined["sat_score"])
-
-axes = [ax1, ax2, ax3]
-spines = ["left", "right", "top", "bottom"]
-
-remove_spines()
-
-ax1.set_xlabel("# of Students")
-ax2.set_xlabel("# of Parents")
-ax3.set_xlabel("# of Teachers")
-ax1.set_ylabel("SAT score")
-
-ax2.set_yticklabels([])
-ax3.set_yticklabels([])
-plt.show()
+show_panel("respondents")
 
 # Safety and Respect score based on respondent response vs. SAT score
-fig, (ax1, ax2) = plt.subplots(1,2, figsize=(7,3))
-fig.suptitle("Safety and Respect score vs. SAT score")
-ax1.scatter(x=combined["saf_s_11"], y=combined["sat_score"])
-ax2.scatter(x=combined["saf_t_11"], y=combined["sat_score"])
-
-axes = [ax1, ax2]
-spines = ["left", "right", "top", "bottom"]
-
-remove_spines()
-
-for ax in axes:
-    for spine in spines:
-        ax.set_xlim(3, 10)
-        ax.set_ylim(800, 2200)
-        
-ax1.set_xlabel("Student Score")
-ax2.set_xlabel("Teacher Score")
-ax1.set_ylabel("SAT score")
-        
-ax2.set_yticklabels([])
-plt.show()
+show_panel("safety")
 
 # Geographic correlations with SAT score (by borough)
 display.Image("ny-boroughs.png", width=500)
@@ -238,61 +205,8 @@ race_fields = ["white_per", "asian_per", "black_per", "hispanic_per"]
 sat_score_corr[race_fields].plot.bar()
 plt.show()
 
-fig, (ax1, ax2, ax3, ax4) = plt.subplots(1,4, figsize=(9,3))
-fig.suptitle("Race vs. SAT score")
-ax1.scatter(x=combined["white_per"], y=combined["sat_score"])
-ax2.scatter(x=combined["asian_per"], y=combined["sat_score"])
-ax3.scatter(x=combined["black_per"], y=combined["sat_score"])
-ax4.scatter(x=combined["hispanic_per"], y=combined["sat_score"])
-
-axes = [ax1, ax2, ax3, ax4]
-spines = ["left", "right", "top", "bottom"]
-
-remove_spines()
-
-for ax in axes:
-    for spine in spines:
-        ax.set_xlim(-5, 105)
-        ax.set_ylim(800, 2200)
-        
-ax1.set_xlabel("% White")
-ax2.set_xlabel("% Asian")
-ax3.set_xlabel("% Black")
-ax4.set_xlabel("% Hispanic")
-ax1.set_ylabel("SAT Score")
-        
-ax2.set_yticklabels([])
-ax3.set_yticklabels([])
-ax4.set_yticklabels([])
-plt.show()
-
-fig, (ax1, ax2, ax3, ax4) = plt.subplots(1,4, figsize=(9,3))
-fig.suptitle("Race vs. Safety and Respect Score")
-ax1.scatter(x=combined["white_per"], y=combined["saf_s_11"])
-ax2.scatter(x=combined["asian_per"], y=combined["saf_s_11"])
-ax3.scatter(x=combined["black_per"], y=combined["saf_s_11"])
-ax4.scatter(x=combined["hispanic_per"], y=combined["saf_s_11"])
-
-axes = [ax1, ax2, ax3, ax4]
-spines = ["left", "right", "top", "bottom"]
-
-remove_spines()
-
-for ax in axes:
-    for spine in spines:
-        ax.set_xlim(-5, 105)
-        ax.set_ylim(4.5, 9.5)
-
-ax1.set_xlabel("% White")
-ax2.set_xlabel("% Asian")
-ax3.set_xlabel("% Black")
-ax4.set_xlabel("% Hispanic")
-ax1.set_ylabel("Safety and Respect Score")
-        
-ax2.set_yticklabels([])
-ax3.set_yticklabels([])
-ax4.set_yticklabels([])
-plt.show()
+show_panel("race")
+show_panel("race_safety")
 
 high_hispanic_pop = combined["hispanic_per"] > 95
 print(combined[high_hispanic_pop][["SCHOOL NAME", "boro"]])
@@ -302,27 +216,7 @@ gender_fields = ["male_per", "female_per"]
 sat_score_corr[gender_fields].plot.bar()
 plt.show()
 
-fig, (ax1, ax2) = plt.subplots(1,2, figsize=(7,3))
-fig.suptitle("Gender vs. SAT score")
-ax1.scatter(x=combined["male_per"], y=combined["sat_score"])
-ax2.scatter(x=combined["female_per"], y=combined["sat_score"])
-
-axes = [ax1, ax2]
-spines = ["left", "right", "top", "bottom"]
-
-remove_spines()
-
-for ax in axes:
-    for spine in spines:
-        ax.set_xlim(-5, 105)
-        ax.set_ylim(800, 2200)
-        
-ax1.set_xlabel("% Male")
-ax2.set_xlabel("% Female")
-ax1.set_ylabel("SAT Score")
-        
-ax2.set_yticklabels([])
-plt.show()
+show_panel("gender")
 
 # High male population and high SAT score
 high_male_perf = (combined["male_per"] > 55) & (combined["sat_score"] > 1700)
@@ -346,3 +240,6 @@ print(combined[high_female_pop][["saf_s_11", "boro", "white_per", "asian_per", "
 combined["ap_per"] = combined["AP Test Takers "]/combined["total_enrollment"]
 combined.plot.scatter(x="ap_per", y="sat_score")
 plt.show()
+
+# Render every scatter panel to disk for the report, in this process so no worker re-runs the script
+render_panels(combined, list(panels.values()), "figures", formats=("png", "svg"), processes=1)
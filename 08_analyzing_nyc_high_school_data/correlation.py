@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+def numeric_columns(frame):
+    return frame.select_dtypes(include=["number", "bool"]).columns
+
+
+def sufficient_stats(frame, columns, target):
+    """Returns a DataFrame of centred statistics (one row per column) against the target.
+
+    n, the means of the column and the target, their sums of squared deviations (m2_x, m2_y)
+    and the sum of products of deviations (c_xy). Rows where either the column or the target
+    is missing are left out pairwise, matching DataFrame.corr.
+    """
+    x = frame[columns].to_numpy(dtype="float64")
+    y = frame[target].to_numpy(dtype="float64")[:, None]
+
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    n = valid.sum(axis=0)
+    count = np.maximum(n, 1)
+    mean_x = np.where(valid, x, 0.0).sum(axis=0) / count
+    mean_y = np.where(valid, y, 0.0).sum(axis=0) / count
+    dx = np.where(valid, x - mean_x, 0.0)
+    dy = np.where(valid, y - mean_y, 0.0)
+
+    return pd.DataFrame({
+        "n": n,
+        "mean_x": mean_x,
+        "mean_y": mean_y,
+        "m2_x": (dx * dx).sum(axis=0),
+        "m2_y": (dy * dy).sum(axis=0),
+        "c_xy": (dx * dy).sum(axis=0),
+    }, index=columns)
+
+
+def combine_stats(a, b):
+    """Merges the centred statistics of two disjoint sets of rows (Chan et al.'s pairwise update)."""
+    n = a["n"] + b["n"]
+    weight = (b["n"] / n.where(n > 0)).fillna(0.0)
+    between = (a["n"] * weight).fillna(0.0)
+    delta_x = b["mean_x"] - a["mean_x"]
+    delta_y = b["mean_y"] - a["mean_y"]
+    return pd.DataFrame({
+        "n": n,
+        "mean_x": a["mean_x"] + delta_x * weight,
+        "mean_y": a["mean_y"] + delta_y * weight,
+        "m2_x": a["m2_x"] + b["m2_x"] + delta_x * delta_x * between,
+        "m2_y": a["m2_y"] + b["m2_y"] + delta_y * delta_y * between,
+        "c_xy": a["c_xy"] + b["c_xy"] + delta_x * delta_y * between,
+    }, index=a.index)
+
+
+class TargetCorrelation:
+    """Pearson correlation of every numeric column against a single target column.
+
+    Matches frame.corr(numeric_only=True)[target] without building the full N x N matrix: a
+    column is NaN when it, or the target over its rows, is constant. Statistics are kept
+    centred on the running means, so large values (e.g. schoolyear) do not lose precision,
+    and are cached so new rows (e.g. another school year) or new columns (e.g. another survey
+    field) only update the affected entries.
+
+    Args:
+    - frame (DataFrame): data set holding the target and the columns to correlate
+    - target (str): name of the column every other column is correlated against
+    """
+
+    def __init__(self, frame, target):
+        self.target = target
+        self.stats = sufficient_stats(frame, numeric_columns(frame), target)
+
+    def append_rows(self, frame):
+        """Folds new rows into the cached statistics of the columns they contain."""
+        columns = numeric_columns(frame).intersection(self.stats.index, sort=False)
+        self.stats.loc[columns] = combine_stats(self.stats.loc[columns], sufficient_stats(frame, columns, self.target))
+
+    def add_columns(self, frame, columns=None):
+        """Computes statistics for columns not seen yet; frame must hold every row seen so far."""
+        if columns is None:
+            columns = numeric_columns(frame).difference(self.stats.index, sort=False)
+        new_stats = sufficient_stats(frame, pd.Index(columns), self.target)
+        self.stats = pd.concat([self.stats.drop(index=new_stats.index, errors="ignore"), new_stats])
+
+    def correlations(self):
+        """Returns a Series of correlation against the target, indexed by column name."""
+        s = self.stats
+        denominator = np.sqrt(s["m2_x"] * s["m2_y"])
+        corr = s["c_xy"] / denominator.where(denominator > 0)
+        return corr.clip(-1, 1).rename(self.target)
+
+    def __getitem__(self, columns):
+        return self.correlations()[columns]
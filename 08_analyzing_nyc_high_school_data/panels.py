@@ -0,0 +1,159 @@
+import os
+from dataclasses import dataclass
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from rendering import hide_spines, map_with_arrays, save_figure
+
+
+@dataclass(frozen=True)
+class PanelSpec:
+    """Declarative description of a 1xN row of scatter plots sharing one y column.
+
+    Args:
+    - name (str): file stem used when the panel is rendered to disk
+    - title (str): figure suptitle
+    - x (list): x column for each subplot, left to right
+    - y (str): column plotted on the y axis of every subplot
+    - xlabels (list): x axis label for each subplot
+    - ylabel (str): y axis label, shown on the first subplot only
+    - xlim (tuple): optional (min, max) applied to every subplot
+    - ylim (tuple): optional (min, max) applied to every subplot
+    - figsize (tuple): figure size in inches
+    """
+    name: str
+    title: str
+    x: tuple
+    y: str
+    xlabels: tuple
+    ylabel: str
+    xlim: tuple = None
+    ylim: tuple = None
+    figsize: tuple = (9, 3)
+
+    def columns(self):
+        return list(self.x) + [self.y]
+
+
+RACE_LABELS = ["% White", "% Asian", "% Black", "% Hispanic"]
+
+# Scatter panels vs. SAT score, by key
+PANELS = {
+    "respondents": PanelSpec(
+        name="respondents_vs_sat",
+        title="Number of respondents vs. SAT score",
+        x=("N_s", "N_p", "N_t"),
+        y="sat_score",
+        xlabels=("# of Students", "# of Parents", "# of Teachers"),
+        ylabel="SAT score",
+    ),
+    "safety": PanelSpec(
+        name="safety_vs_sat",
+        title="Safety and Respect score vs. SAT score",
+        x=("saf_s_11", "saf_t_11"),
+        y="sat_score",
+        xlabels=("Student Score", "Teacher Score"),
+        ylabel="SAT score",
+        xlim=(3, 10),
+        ylim=(800, 2200),
+        figsize=(7, 3),
+    ),
+    "race": PanelSpec(
+        name="race_vs_sat",
+        title="Race vs. SAT score",
+        x=("white_per", "asian_per", "black_per", "hispanic_per"),
+        y="sat_score",
+        xlabels=tuple(RACE_LABELS),
+        ylabel="SAT Score",
+        xlim=(-5, 105),
+        ylim=(800, 2200),
+    ),
+    "race_safety": PanelSpec(
+        name="race_vs_safety",
+        title="Race vs. Safety and Respect Score",
+        x=("white_per", "asian_per", "black_per", "hispanic_per"),
+        y="saf_s_11",
+        xlabels=tuple(RACE_LABELS),
+        ylabel="Safety and Respect Score",
+        xlim=(-5, 105),
+        ylim=(4.5, 9.5),
+    ),
+    "gender": PanelSpec(
+        name="gender_vs_sat",
+        title="Gender vs. SAT score",
+        x=("male_per", "female_per"),
+        y="sat_score",
+        xlabels=("% Male", "% Female"),
+        ylabel="SAT Score",
+        xlim=(-5, 105),
+        ylim=(800, 2200),
+        figsize=(7, 3),
+    ),
+}
+
+
+def column_arrays(frame, specs):
+    """Returns a dict of column name -> NumPy array for every column the specs use.
+
+    The arrays are views on the frame's data where pandas allows it, so no frame copy is made.
+    """
+    needed = {column for spec in specs for column in spec.columns()}
+    return {column: frame[column].to_numpy(copy=False) for column in needed}
+
+
+def draw_panel(fig, spec, arrays):
+    """Draws a panel onto an existing figure and returns its axes."""
+    axes = fig.subplots(1, len(spec.x), squeeze=False)[0]
+    fig.suptitle(spec.title)
+    y = arrays[spec.y]
+
+    for i, (ax, column, xlabel) in enumerate(zip(axes, spec.x, spec.xlabels)):
+        ax.scatter(arrays[column], y)
+        hide_spines(ax)
+        ax.tick_params(left=0, bottom=0)
+        ax.grid(alpha=0.5)
+        if spec.xlim is not None:
+            ax.set_xlim(*spec.xlim)
+        if spec.ylim is not None:
+            ax.set_ylim(*spec.ylim)
+        ax.set_xlabel(xlabel)
+        if i == 0:
+            ax.set_ylabel(spec.ylabel)
+        else:
+            ax.set_yticklabels([])
+
+    return axes
+
+
+def render_panel(spec, arrays, out_dir, formats=("png",)):
+    """Renders a single panel with the Agg backend and returns the written paths."""
+    fig = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(fig)
+    draw_panel(fig, spec, arrays)
+    return save_figure(fig, spec.name, out_dir, formats)
+
+
+def _render(arrays, spec, out_dir, formats):
+    return render_panel(spec, arrays, out_dir, formats)
+
+
+def render_panels(frame, specs, out_dir, formats=("png",), processes=None):
+    """Renders every panel to disk, spreading independent figures across a process pool.
+
+    The column arrays are put in shared memory once and mapped by every worker (see
+    rendering.map_with_arrays), so they are neither copied per worker nor per figure.
+
+    Args:
+    - frame (DataFrame): data set holding every column referenced by the specs
+    - specs (list): PanelSpec objects to render
+    - out_dir (str): directory the images are written to
+    - formats (tuple): image formats to write, e.g. ("png", "svg")
+    - processes (int): number of worker processes; 1 renders in the current process
+
+    Returns a dict of spec name -> list of written paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    arrays = column_arrays(frame, specs)
+    paths = map_with_arrays(_render, arrays, [(spec, out_dir, formats) for spec in specs], processes)
+    return {spec.name: spec_paths for spec, spec_paths in zip(specs, paths)}
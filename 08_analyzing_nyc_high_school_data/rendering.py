@@ -0,0 +1,104 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+SPINES = ["left", "right", "top", "bottom"]
+
+
+def hide_spines(ax):
+    for spine in SPINES:
+        ax.spines[spine].set_visible(False)
+
+
+def save_figure(fig, name, out_dir, formats=("png",)):
+    """Writes fig as out_dir/name.<format> for every format and returns the written paths."""
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        fig.savefig(path, format=fmt, bbox_inches="tight")
+        paths.append(path)
+    return paths
+
+
+class SharedArrays:
+    """Context manager copying a dict of NumPy arrays into shared memory blocks once.
+
+    layout maps every name to (block name, shape, dtype), which is all a worker needs to map
+    the arrays with attach(). Object arrays have no fixed-size buffer and are carried in the
+    layout itself, so they are still pickled once per worker. The blocks are freed on exit.
+
+    Args:
+    - arrays (dict): name -> ndarray
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.blocks = []
+        self.layout = {}
+
+    def __enter__(self):
+        for name, array in self.arrays.items():
+            array = np.asarray(array)
+            if array.dtype.hasobject:
+                self.layout[name] = array
+                continue
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            self.blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.layout[name] = (block.name, array.shape, array.dtype.str)
+        return self.layout
+
+    def __exit__(self, *exc_info):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+# Arrays mapped by each worker process from the SharedArrays layout
+_worker_arrays = None
+_worker_blocks = []
+
+
+def attach(layout):
+    """Maps the arrays of a SharedArrays layout read-only into this process."""
+    global _worker_arrays
+    arrays = {}
+    for name, entry in layout.items():
+        if isinstance(entry, np.ndarray):
+            arrays[name] = entry
+            continue
+        block_name, shape, dtype = entry
+        # Workers share the parent's resource tracker, so the parent's unlink covers them too
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype, buffer=block.buf)
+        arrays[name].flags.writeable = False
+    _worker_arrays = arrays
+
+
+def _call_with_arrays(function, task):
+    return function(_worker_arrays, *task)
+
+
+def map_with_arrays(function, arrays, tasks, processes=None):
+    """Returns [function(arrays, *task) for task in tasks], spread across a process pool.
+
+    The arrays are placed in shared memory once and mapped by every worker, instead of being
+    pickled to each worker or with every task. function must be defined at module level.
+
+    Args:
+    - function (function): called as function(arrays, *task); its result must pickle
+    - arrays (dict): name -> ndarray, read-only in the workers
+    - tasks (list): argument tuples, e.g. one per figure
+    - processes (int): number of worker processes; 1 runs in the current process
+    """
+    tasks = list(tasks)
+    if processes == 1 or len(tasks) <= 1:
+        return [function(arrays, *task) for task in tasks]
+
+    with SharedArrays(arrays) as layout:
+        with ProcessPoolExecutor(max_workers=processes, initializer=attach, initargs=(layout,)) as pool:
+            futures = [pool.submit(_call_with_arrays, function, task) for task in tasks]
+            return [future.result() for future in futures]
@@ -0,0 +1,131 @@
+"""Bootstrap confidence intervals for the crosstab() metrics.
+
+Run as a script to compute the gender intervals of the analysis across a process pool:
+
+Usage: python bootstrap.py [--resamples 5000] [--seed 538] [--processes N]
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from crosstab import EPISODES, cell_layout, crosstab
+
+
+def resample_weights(rng, n_respondents, resamples):
+    """Draws a (resamples x respondents) index matrix and returns how often each respondent was drawn."""
+    idx = rng.integers(0, n_respondents, size=(resamples, n_respondents))
+    offsets = (np.arange(resamples) * n_respondents)[:, None]
+    counts = np.bincount((idx + offsets).ravel(), minlength=resamples * n_respondents)
+    return counts.reshape(resamples, n_respondents).astype("float64")
+
+
+def resampled_metrics(layout, weights):
+    """Computes watched share and mean rank for every cell of every resample at once.
+
+    Args:
+    - layout (dict): cell layout from crosstab.cell_layout
+    - weights (ndarray): (resamples x respondents) draw counts
+
+    Returns two (resamples x cells x episodes) arrays: watched share and mean rank.
+    """
+    rows, cells = layout["rows"], layout["cells"]
+    onehot = np.zeros((len(rows), layout["n_cells"]))
+    onehot[np.arange(len(rows)), cells] = 1.0
+
+    # Draw counts of each membership, then summed per cell with one matrix product per episode
+    w = weights[:, rows]
+    respondents = w @ onehot
+
+    def per_cell(values):
+        return np.stack([(w * values[:, e]) @ onehot for e in range(len(EPISODES))], axis=2)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        watched_share = per_cell(layout["watched"]) / respondents[:, :, None]
+        mean_rank = per_cell(layout["ranks"]) / per_cell(layout["ranked"])
+    return watched_share, mean_rank
+
+
+def _run_batches(layout, batches):
+    """Runs (seed sequence, resamples) batches in order, each from its own random stream."""
+    watched, ranks = [], []
+    for seed_sequence, resamples in batches:
+        weights = resample_weights(np.random.default_rng(seed_sequence), layout["n_respondents"], resamples)
+        batch_watched, batch_ranks = resampled_metrics(layout, weights)
+        watched.append(batch_watched)
+        ranks.append(batch_ranks)
+    return np.concatenate(watched), np.concatenate(ranks)
+
+
+def bootstrap_crosstab(segments, names, by=None, resamples=2000, alpha=0.05, seed=None,
+                       processes=None, batch_size=200):
+    """Bootstrap confidence intervals for every (segment, group, episode) metric of crosstab().
+
+    Respondents are resampled with replacement in batches of batch_size resamples. Every batch
+    draws from its own stream spawned from seed, and workers are handed whole batches, so the
+    results depend only on seed and batch_size, not on the number of processes.
+
+    Args:
+    - segments (Segments): cached respondent masks over the recoded survey
+    - names (list): segment names to tabulate
+    - by (list): demographic columns to split each segment by
+    - resamples (int): number of bootstrap resamples
+    - alpha (float): the interval covers the central 1 - alpha of the bootstrap distribution
+    - seed (int): seed for the root of the per-batch random streams
+    - processes (int): number of worker processes; 1 runs in the current process
+    - batch_size (int): resamples computed together in one batch of matrix products
+
+    Returns a DataFrame indexed by (segment, *by) with columns (metric, stat, episode), where
+    metric is "watched" or "rank" and stat is "estimate", "lower" or "upper".
+    """
+    layout = cell_layout(segments, names, by)
+    estimate = crosstab(segments, names, by)
+
+    sizes = [min(batch_size, resamples - start) for start in range(0, resamples, batch_size)]
+    batches = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+    processes = processes or os.cpu_count() or 1
+    processes = max(1, min(processes, len(batches)))
+    if processes == 1:
+        results = [_run_batches(layout, batches)]
+    else:
+        # Consecutive runs of batches per worker, so the layout is sent once per worker
+        shares = np.array_split(np.arange(len(batches)), processes)
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_run_batches, layout, [batches[i] for i in share]) for share in shares]
+            results = [future.result() for future in futures]
+
+    frames = {}
+    for i, metric in enumerate(["watched", "rank"]):
+        draws = np.concatenate([result[i] for result in results])
+        lower, upper = np.nanpercentile(draws, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+        frames[(metric, "estimate")] = estimate[metric]
+        frames[(metric, "lower")] = pd.DataFrame(lower, index=estimate.index, columns=EPISODES)
+        frames[(metric, "upper")] = pd.DataFrame(upper, index=estimate.index, columns=EPISODES)
+
+    return pd.concat(frames, axis=1)
+
+
+def main():
+    from ingest import COLUMN_NAMES, ENCODING
+    from recoding import recode
+    from segments import Segments
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default="star_wars.csv")
+    parser.add_argument("--resamples", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=538)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    survey = recode(pd.read_csv(args.path, encoding=ENCODING).rename(columns=COLUMN_NAMES))
+    gender_ci = bootstrap_crosstab(Segments(survey), ["seen", "fans", "true_fans"], by=["Gender"],
+                                   resamples=args.resamples, seed=args.seed, processes=args.processes)
+    print(gender_ci.loc[("true_fans", "Female"), "watched"])
+    print(gender_ci.loc[("true_fans", "Female"), "rank"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from segments import WATCHED_COLUMNS
+
+RANKED_COLUMNS = [f"Ranked Ep {i}" for i in range(1, 7)]
+EPISODES = list(range(1, 7))
+
+
+def group_codes(frame, by):
+    """Returns one integer group code per respondent and the index of every group.
+
+    Respondents missing any of the `by` columns get code -1 and are left out.
+    """
+    if not by:
+        return np.zeros(len(frame), dtype=np.intp), None
+
+    codes, levels = [], []
+    for column in by:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            column_codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            column_codes, uniques = pd.factorize(values, sort=True)
+        codes.append(column_codes)
+        levels.append(uniques)
+
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    flat = np.ravel_multi_index([np.where(valid, c, 0) for c in codes], [len(l) for l in levels])
+    return np.where(valid, flat, -1), pd.MultiIndex.from_product(levels, names=by)
+
+
+def cell_layout(segments, names, by=None):
+    """Assigns every (respondent, segment) membership to a (segment, group) cell.
+
+    Returns a dict holding the respondent row and cell of each membership, the watched and rank
+    values of those rows, and the index labelling every cell.
+    """
+    by = list(by or [])
+    frame = segments.frame
+    groups, group_index = group_codes(frame, by)
+    n_groups = 1 if group_index is None else len(group_index)
+
+    membership = np.column_stack([segments.mask(name) for name in names]) & (groups >= 0)[:, None]
+    rows, segment = np.nonzero(membership)
+
+    ranks = frame[RANKED_COLUMNS].to_numpy(dtype="float64")[rows]
+    ranked = ~np.isnan(ranks)
+
+    if group_index is None:
+        index = pd.Index(names, name="segment")
+    else:
+        index = pd.MultiIndex.from_tuples(
+            [(name, *(key if isinstance(key, tuple) else (key,))) for name in names for key in group_index],
+            names=["segment", *by],
+        )
+
+    return {
+        "rows": rows,
+        "cells": segment * n_groups + groups[rows],
+        "n_cells": len(names) * n_groups,
+        "n_respondents": len(frame),
+        "watched": frame[WATCHED_COLUMNS].to_numpy(dtype="float64")[rows],
+        "ranks": np.where(ranked, ranks, 0.0),
+        "ranked": ranked.astype("float64"),
+        "index": index,
+    }
+
+
+def metrics_frame(index, respondents, watched_share, mean_rank):
+    columns = pd.MultiIndex.from_tuples(
+        [("respondents", "")] + [("watched", e) for e in EPISODES] + [("rank", e) for e in EPISODES]
+    )
+    values = np.column_stack([respondents, watched_share, mean_rank])
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def crosstab(segments, names, by=None):
+    """Computes watched share and mean rank per episode for every (segment, group) cell.
+
+    All cells are filled in one grouped pass: each respondent is assigned a cell per segment
+    it belongs to, and the watched and rank blocks are summed per cell with np.bincount.
+    Adding a demographic dimension is one more entry in `by`, not another set of frame copies.
+
+    Args:
+    - segments (Segments): cached respondent masks over the recoded survey
+    - names (list): segment names to tabulate, e.g. ["seen", "fans", "true_fans"]
+    - by (list): demographic columns to split each segment by, e.g. ["Gender", "Age"]
+
+    Returns a DataFrame indexed by (segment, *by) with a "respondents" column and "watched"
+    and "rank" column groups holding one column per episode.
+    """
+    layout = cell_layout(segments, names, by)
+    cells, n_cells = layout["cells"], layout["n_cells"]
+
+    def per_cell(values):
+        return np.column_stack([np.bincount(cells, values[:, e], n_cells) for e in range(len(EPISODES))])
+
+    respondents = np.bincount(cells, minlength=n_cells)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        watched_share = per_cell(layout["watched"]) / respondents[:, None]
+        mean_rank = per_cell(layout["ranks"]) / per_cell(layout["ranked"])
+
+    return metrics_frame(layout["index"], respondents, watched_share, mean_rank)
@@ -1,8 +1,12 @@
 import pandas as pd
-import numpy as np
 import warnings
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
+from ingest import COLUMN_NAMES
+from recoding import recode
+from segments import Segments
+from crosstab import crosstab
+from bootstrap import bootstrap_crosstab
 
 # %matplotlib inline
 warnings.filterwarnings("ignore")
@@ -21,38 +25,7 @@ print(star_wars.head(10))
 print(star_wars.columns)
 
 # Rename column headers
-star_wars = star_wars.rename(columns={
-    "Have you seen any of the 6 films in the Star Wars franchise?":"Have you seen at least one Star Wars film?",
-    "Do you consider yourself to be a fan of the Star Wars film franchise?":"Are you a Star Wars fan?",
-    "Which of the following Star Wars films have you seen? Please select all that apply.":"Watched Ep 1",
-    "Unnamed: 4":"Watched Ep 2",
-    "Unnamed: 5":"Watched Ep 3",
-    "Unnamed: 6":"Watched Ep 4",
-    "Unnamed: 7":"Watched Ep 5",
-    "Unnamed: 8":"Watched Ep 6",
-    "Please rank the Star Wars films in order of preference with 1 being your favorite film in the franchise and 6 being your least favorite film.":"Ranked Ep 1",
-    "Unnamed: 10":"Ranked Ep 2",
-    "Unnamed: 11":"Ranked Ep 3",
-    "Unnamed: 12":"Ranked Ep 4",
-    "Unnamed: 13":"Ranked Ep 5",
-    "Unnamed: 14":"Ranked Ep 6",
-    "Please state whether you view the following characters favorably, unfavorably, or are unfamiliar with him/her.": "Han Solo",
-    "Unnamed: 16":"Luke Skywalker",
-    "Unnamed: 17":"Princess Leia Organa",
-    "Unnamed: 18":"Anakin Skywalker",
-    "Unnamed: 19":"Obi Wan Kenobi",
-    "Unnamed: 20":"Emperor Palpatine",
-    "Unnamed: 21":"Darth Vader",
-    "Unnamed: 22":"Lando Calrissian",
-    "Unnamed: 23":"Boba Fett",
-    "Unnamed: 24":"C-3P0",
-    "Unnamed: 25":"R2-D2",
-    "Unnamed: 26":"Jar Jar Binks",
-    "Unnamed: 27":"Padme Amidala",
-    "Unnamed: 28":"Yoda",
-    "Do you consider yourself to be a fan of the Expanded Universe?":"Are you an Expanded Universe fan?",
-    "Do you consider yourself to be a fan of the Star Trek franchise?":"Are you a Star Trek fan?"
-})
+star_wars = star_wars.rename(columns=COLUMN_NAMES)
 
 # Cleaned column names
 print(star_wars.columns)
@@ -64,81 +37,35 @@ star_wars.info(verbose=True)
 for column in star_wars.columns:
     print(star_wars[column].unique())
     
-bool_yes_no = {
-    "Yes": True,
-    "No": False,
-    np.NaN: False,
-}
-
-for column in [
-    'Have you seen at least one Star Wars film?',
-    'Are you a Star Wars fan?',
-    'Are you familiar with the Expanded Universe?',
-    'Are you an Expanded Universe fan?', 
-    'Are you a Star Trek fan?'
-]:
-    star_wars[column] = star_wars[column].map(bool_yes_no)
-    
+# Recode the Yes/No, watched, ranking, favorability and demographic blocks in one pass each
+star_wars = recode(star_wars)
+
 print(star_wars.iloc[:,1].value_counts())
 
-# Clean and map columns for watched movies
-bool_watched_movie = {
-    'Star Wars: Episode I  The Phantom Menace': True,
-    'Star Wars: Episode II  Attack of the Clones': True,
-    'Star Wars: Episode III  Revenge of the Sith': True,
-    'Star Wars: Episode IV  A New Hope': True,
-    'Star Wars: Episode V The Empire Strikes Back': True,
-    'Star Wars: Episode VI Return of the Jedi': True,
-    np.NaN: False
-}
-
-for column in star_wars.columns[3:9]:
-    star_wars[column] = star_wars[column].map(bool_watched_movie)
-    
 print(star_wars.iloc[:,3].value_counts())
 
 print(star_wars.iloc[:,8].value_counts())
 
-# Clean and map columns for character favorability
-bool_chars = {
-    "Very favorably":1,
-    "Somewhat favorably":2,
-    "Neither favorably nor unfavorably (neutral)":3,
-    "Somewhat unfavorably":4,
-    "Very unfavorably":5,
-    "Unfamiliar (N/A)":6,
-    np.NaN: 6
-}
-
-for column in star_wars.columns[15:29]:
-    star_wars[column] = star_wars[column].map(bool_chars)
-    
 # Check order of Age values
 star_wars["Age"].value_counts().sort_index()
 
-seen_star_wars = star_wars[star_wars["Have you seen at least one Star Wars film?"] == True]
+# Respondent segments are cached masks over the whole survey
+segments = Segments(star_wars)
+
+seen_star_wars = segments.population("claims_seen")
 print(len(seen_star_wars))
 
-not_seen_star_wars = star_wars[star_wars["Have you seen at least one Star Wars film?"] == False]
+not_seen_star_wars = segments.population("not_seen")
 print(len(not_seen_star_wars))
 
 print(seen_star_wars.head(10))
 
-false_positives = []
-
-for i in range(len(star_wars)):
-    count = 0
-    row = star_wars.iloc[i]
-    for column in range(3, 9):
-        if row[column] == False and row[1] == True:
-            count += 1
-            
-    if count == 6:
-        false_positives.append(i)
-        star_wars.iloc[i,1] = False
-        
+# Respondents who claim to have seen a film but did not select any of the six
+false_positives = list(star_wars.index[segments.mask("false_positives")])
+star_wars["Have you seen at least one Star Wars film?"] = segments.mask("seen")
+
 print(false_positives)
-seen_star_wars = seen_star_wars.drop(index=false_positives)
+seen_star_wars = segments.population("seen")
 print(len(false_positives))
 print(len(seen_star_wars))
 
@@ -236,17 +163,7 @@ plt.title(f"Of {len(seen_star_wars)} respondents who watched at least one Star W
 highest_rated(seen_star_wars, [li,li,li,li,da,li])
 plt.title(f"Of {len(seen_star_wars)} respondents who watched at least one Star Wars film", x=0.11, y=1.12, fontname="Arial", fontsize=13)
 
-seen_all_movies = star_wars
-
-for i in range(len(star_wars)):
-    count = 0
-    row = star_wars.iloc[i]
-    for column in range(3, 9):
-        if row[column] == True and row[1] == True:
-            count += 1
-            
-    if count != 6:
-        seen_all_movies = seen_all_movies.drop(index=i)
+seen_all_movies = segments.population("seen_all")
 
 print(len(seen_all_movies))
 print(len(seen_all_movies)/len(star_wars))
@@ -261,7 +178,7 @@ plt.title(f"Of {len(seen_all_movies)} respondents who watched all six Star Wars
 
 len(not_seen_star_wars[not_seen_star_wars["Are you a Star Wars fan?"]==True])
 
-star_wars_fans = seen_star_wars[seen_star_wars["Are you a Star Wars fan?"]==True]
+star_wars_fans = segments.population("fans")
 
 print(f"Number of respondents who have seen at least one Star Wars film: {len(seen_star_wars)}")
 print(f"Number of watchers who identify as Star Wars fan: {len(star_wars_fans)}")
@@ -276,7 +193,7 @@ plt.title(f"Of {len(star_wars_fans)} Star Wars fans who watched at least one Sta
 
 # True Star Wars fans
 
-true_star_wars_fans = seen_all_movies[seen_all_movies["Are you a Star Wars fan?"]==True]
+true_star_wars_fans = segments.population("true_fans")
 
 print(f"Number of respondents who have seen all six films: {len(seen_all_movies)}")
 print(f"Number of all six movie watchers who identify as Star Wars fan: {len(true_star_wars_fans)}")
@@ -292,7 +209,7 @@ plt.title(f"Of {len(true_star_wars_fans)} Star Wars fans who watched all six Sta
 
 # Star Trek fans
 
-star_trek_fans = seen_star_wars[seen_star_wars["Are you a Star Trek fan?"]==True]
+star_trek_fans = segments.population("trek_fans")
 
 print(f"Number of respondents who identify as Star Trek fan: {len(star_trek_fans)}")
 
@@ -319,26 +236,23 @@ star_wars["Gender"][star_wars["Are you a Star Trek fan?"]==True].value_counts(no
 seen_all_movies["Gender"][seen_all_movies["Are you a Star Wars fan?"]==True].value_counts(normalize=True)
 seen_all_movies["Gender"][(seen_all_movies["Are you a Star Wars fan?"]==True) & (seen_all_movies["Are you a Star Trek fan?"]==True)].value_counts(normalize=True)
 
-females = seen_star_wars[seen_star_wars["Gender"]=="Female"]
-female_star_wars_fans = seen_star_wars[(seen_star_wars["Gender"]=="Female") & (seen_star_wars["Are you a Star Wars fan?"]==True)]
-female_true_star_wars_fans = seen_all_movies[(seen_all_movies["Gender"]=="Female") & (seen_all_movies["Are you a Star Wars fan?"]==True)]
-
-males = seen_star_wars[seen_star_wars["Gender"]=="Male"]
-male_star_wars_fans = seen_star_wars[(seen_star_wars["Gender"]=="Male") & (seen_star_wars["Are you a Star Wars fan?"]==True)]
-male_true_star_wars_fans = seen_all_movies[(seen_all_movies["Gender"]=="Male") & (seen_all_movies["Are you a Star Wars fan?"]==True)]
+# Watched share and average rank for every gender segment in one grouped pass
+gender_metrics = crosstab(segments, ["seen", "fans", "true_fans"], by=["Gender"])
 
-populations = [females, female_star_wars_fans, female_true_star_wars_fans, males, male_star_wars_fans, male_true_star_wars_fans]
+populations = [
+    ("seen", "Female"),
+    ("fans", "Female"),
+    ("true_fans", "Female"),
+    ("seen", "Male"),
+    ("fans", "Male"),
+    ("true_fans", "Male"),
+]
 
 # Gender: Most Viewed Movies
 
 percents_seen = {}
 for i, pop in enumerate(populations):
-    values = []
-    for j in range(1,7):
-        percent_seen = pop[f"Watched Ep {j}"].sum() / len(pop)
-        values.append(percent_seen)
-
-    percents_seen[i] = values
+    percents_seen[i] = gender_metrics.loc[pop, "watched"].values
 
 pop_1_values = percents_seen[0]
 pop_2_values = percents_seen[1]
@@ -383,8 +297,7 @@ plt.show()
 
 average_ratings = {}
 for i, pop in enumerate(populations):
-    average_rating = pop[pop.columns[9:15]].mean()
-    average_ratings[i] = average_rating
+    average_ratings[i] = gender_metrics.loc[pop, "rank"].values
 
 pop_1_values = average_ratings[0]
 pop_2_values = average_ratings[1]
@@ -424,6 +337,13 @@ ax.tick_params(left=False, bottom=False)
 
 plt.show()
 
+# Gender: 95% bootstrap confidence intervals for the small segments
+# Runs in this process; `python bootstrap.py` spreads the same resamples over a process pool
+gender_ci = bootstrap_crosstab(segments, ["seen", "fans", "true_fans"], by=["Gender"], resamples=5000, seed=538,
+                               processes=1)
+print(gender_ci.loc[("true_fans", "Female"), "watched"])
+print(gender_ci.loc[("true_fans", "Female"), "rank"])
+
 # Education
 
 star_wars["Education"].value_counts(normalize=True)
@@ -491,29 +411,8 @@ plt.title("Respondents who have seen Star Wars", y = 1.2, fontname="Arial", font
 
 # Explore major age population segments
 
-# Explore major age population segments: Respondents by age who have seen at least one Star Wars movie
-ages_18_seen = seen_star_wars[seen_star_wars["Age"]=="18-29"]
-ages_30_seen = seen_star_wars[seen_star_wars["Age"]=="30-44"]
-ages_45_seen = seen_star_wars[seen_star_wars["Age"]=="45-60"]
-ages_60_seen = seen_star_wars[seen_star_wars["Age"]=="> 60"]
-
-# Explore major age population segments: Respondents by age who have seen all six movies
-ages_18_all = seen_all_movies[seen_all_movies["Age"]=="18-29"]
-ages_30_all = seen_all_movies[seen_all_movies["Age"]=="30-44"]
-ages_45_all = seen_all_movies[seen_all_movies["Age"]=="45-60"]
-ages_60_all = seen_all_movies[seen_all_movies["Age"]=="> 60"]
-
-# Explore major age population segments: Respondents by age who identified as a Star Wars fan and have seen at least one movie
-ages_18_fan = star_wars_fans[star_wars_fans["Age"]=="18-29"]
-ages_30_fan = star_wars_fans[star_wars_fans["Age"]=="30-44"]
-ages_45_fan = star_wars_fans[star_wars_fans["Age"]=="45-60"]
-ages_60_fan = star_wars_fans[star_wars_fans["Age"]=="> 60"]
-
-# Explore major age population segments: Respondents by age who identified as a Star Wars fan and have seen all six movies
-ages_18_true_fan = true_star_wars_fans[true_star_wars_fans["Age"]=="18-29"]
-ages_30_true_fan = true_star_wars_fans[true_star_wars_fans["Age"]=="30-44"]
-ages_45_true_fan = true_star_wars_fans[true_star_wars_fans["Age"]=="45-60"]
-ages_60_true_fan = true_star_wars_fans[true_star_wars_fans["Age"]=="> 60"]
+# Watched share and average rank for every age segment in one grouped pass
+age_metrics = crosstab(segments, ["seen", "seen_all", "fans", "true_fans"], by=["Age"])
 
 # Create functions to plot grouped age distributions
 
@@ -524,22 +423,16 @@ da = "#2a4858" # dark
 
 # Age: Most Viewed Movies
 
-def age_most_viewed(populations):
+def age_most_viewed(metrics):
     """Generates plot showing most viewed movies in ascending order by episode for each age group.
     
     Args:
-    - population (function): name of the data set or subset
-    - colors (list): list of four strings either 'li', 'me', 'ha, or 'da' to denote light or dark colors for each bar
+    - metrics (DataFrame): crosstab rows for one segment, one row per age group in ascending order
     """
     
     percents_seen = {}
-    for i, pop in enumerate(populations):
-        values = []
-        for j in range(1,7):
-            percent_seen = pop[f"Watched Ep {j}"].sum() / len(pop)
-            values.append(percent_seen)
-
-        percents_seen[i] = values
+    for i in range(len(metrics)):
+        percents_seen[i] = metrics["watched"].iloc[i].values
 
     pop_1_values = percents_seen[0]
     pop_2_values = percents_seen[1]
@@ -578,18 +471,16 @@ def age_most_viewed(populations):
 
 # Age: Highest Rated Movies
 
-def age_highest_rated(populations):
+def age_highest_rated(metrics):
     """Generates plot showing highest rated movies in ascending order by episode for each age group.
     
     Args:
-    - population (function): name of the data set or subset
-    - colors (list): list of four strings either 'li', 'me', 'ha, or 'da' to denote light or dark colors for each bar
+    - metrics (DataFrame): crosstab rows for one segment, one row per age group in ascending order
     """
     
     average_ratings = {}
-    for i, pop in enumerate(populations):
-        average_rating = pop[pop.columns[9:15]].mean()
-        average_ratings[i] = average_rating
+    for i in range(len(metrics)):
+        average_ratings[i] = metrics["rank"].iloc[i].values
 
     pop_1_values = average_ratings[0]
     pop_2_values = average_ratings[1]
@@ -626,21 +517,21 @@ def age_highest_rated(populations):
     plt.show()
     
 # Respondents by age who have seen at least one Star Wars movie
-populations = [ages_18_seen, ages_30_seen, ages_45_seen, ages_60_seen]
+populations = age_metrics.loc["seen"]
 age_most_viewed(populations)
 age_highest_rated(populations)
 
 # Respondents by age who have seen all six movies
 
-populations = [ages_18_all, ages_30_all, ages_45_all, ages_60_all]
+populations = age_metrics.loc["seen_all"]
 age_most_viewed(populations)
 age_highest_rated(populations)
 
 # Star Wars fans by age
-populations = [ages_18_fan, ages_30_fan, ages_45_fan, ages_60_fan]
+populations = age_metrics.loc["fans"]
 age_most_viewed(populations)
 age_highest_rated(populations)
 
 # True Star Wars fans by age
-populations = [ages_18_true_fan, ages_30_true_fan, ages_45_true_fan, ages_60_true_fan]
+populations = age_metrics.loc["true_fans"]
 age_highest_rated(populations)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+from recoding import recode
+
+ENCODING = "ISO-8859-1"
+
+# Raw survey headers -> analysis column names; the blank headers of multi-column questions
+# are read by pandas as "Unnamed: <position>"
+COLUMN_NAMES = {
+    "Have you seen any of the 6 films in the Star Wars franchise?": "Have you seen at least one Star Wars film?",
+    "Do you consider yourself to be a fan of the Star Wars film franchise?": "Are you a Star Wars fan?",
+    "Which of the following Star Wars films have you seen? Please select all that apply.": "Watched Ep 1",
+    "Unnamed: 4": "Watched Ep 2",
+    "Unnamed: 5": "Watched Ep 3",
+    "Unnamed: 6": "Watched Ep 4",
+    "Unnamed: 7": "Watched Ep 5",
+    "Unnamed: 8": "Watched Ep 6",
+    "Please rank the Star Wars films in order of preference with 1 being your favorite film in the franchise and 6 being your least favorite film.": "Ranked Ep 1",
+    "Unnamed: 10": "Ranked Ep 2",
+    "Unnamed: 11": "Ranked Ep 3",
+    "Unnamed: 12": "Ranked Ep 4",
+    "Unnamed: 13": "Ranked Ep 5",
+    "Unnamed: 14": "Ranked Ep 6",
+    "Please state whether you view the following characters favorably, unfavorably, or are unfamiliar with him/her.": "Han Solo",
+    "Unnamed: 16": "Luke Skywalker",
+    "Unnamed: 17": "Princess Leia Organa",
+    "Unnamed: 18": "Anakin Skywalker",
+    "Unnamed: 19": "Obi Wan Kenobi",
+    "Unnamed: 20": "Emperor Palpatine",
+    "Unnamed: 21": "Darth Vader",
+    "Unnamed: 22": "Lando Calrissian",
+    "Unnamed: 23": "Boba Fett",
+    "Unnamed: 24": "C-3P0",
+    "Unnamed: 25": "R2-D2",
+    "Unnamed: 26": "Jar Jar Binks",
+    "Unnamed: 27": "Padme Amidala",
+    "Unnamed: 28": "Yoda",
+    "Do you consider yourself to be a fan of the Expanded Universe?": "Are you an Expanded Universe fan?",
+    "Do you consider yourself to be a fan of the Star Trek franchise?": "Are you a Star Trek fan?",
+}
+
+
+class RespondentIds:
+    """Set of respondent IDs seen so far, kept in a Python set (a hash set).
+
+    Used to drop respondents already seen in earlier chunks without holding every chunk. Each
+    chunk costs time proportional to its own size, however many IDs have been seen.
+    """
+
+    def __init__(self):
+        self.ids = set()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add_new(self, ids):
+        """Adds ids to the set and returns a mask of the ones not seen before.
+
+        Duplicates within ids are resolved in favour of the first occurrence.
+        """
+        ids = np.asarray(ids, dtype="int64")
+        _, first = np.unique(ids, return_index=True)
+        new = np.zeros(len(ids), dtype=bool)
+        new[first] = True
+
+        values = ids.tolist()
+        new &= ~np.fromiter(map(self.ids.__contains__, values), dtype=bool, count=len(values))
+        self.ids.update(ids[new].tolist())
+        return new
+
+
+def has_second_header(path, encoding=ENCODING):
+    """True if the row after the header is a second header row (no RespondentID) rather than data."""
+    first = pd.read_csv(path, encoding=encoding, nrows=1)
+    return len(first) > 0 and pd.isna(first["RespondentID"].iloc[0])
+
+
+def read_chunks(path, chunksize=100_000, encoding=ENCODING):
+    """Yields renamed survey chunks with duplicate respondents (across all chunks) removed.
+
+    Args:
+    - path (str): raw survey CSV
+    - chunksize (int): rows read per chunk; peak memory is bounded by this
+    - encoding (str): file encoding
+    """
+    skiprows = [1] if has_second_header(path, encoding) else None
+    ids = RespondentIds()
+
+    reader = pd.read_csv(path, encoding=encoding, chunksize=chunksize, skiprows=skiprows)
+    for chunk in reader:
+        respondent_ids = pd.to_numeric(chunk["RespondentID"], errors="coerce")
+        chunk = chunk[respondent_ids.notna()].assign(RespondentID=respondent_ids.dropna().astype("int64"))
+        chunk = chunk[ids.add_new(chunk["RespondentID"].to_numpy())]
+        yield chunk.rename(columns=COLUMN_NAMES)
+
+
+def ingest(path, out_path, chunksize=100_000, encoding=ENCODING):
+    """Streams a survey wave into a Parquet file, recoding one chunk at a time.
+
+    Requires pyarrow. Category columns are written as strings, which Parquet dictionary-encodes,
+    so every chunk shares one schema whatever categories it happens to contain.
+
+    Returns the number of respondents written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    rows = 0
+    try:
+        for chunk in read_chunks(path, chunksize, encoding):
+            recoded = recode(chunk)
+            for column in recoded.select_dtypes(include="category").columns:
+                recoded[column] = recoded[column].astype(object)
+            table = pa.Table.from_pandas(recoded, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, table.schema)
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            rows += len(recoded)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
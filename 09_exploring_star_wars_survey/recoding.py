@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+YES_NO_COLUMNS = [
+    "Have you seen at least one Star Wars film?",
+    "Are you a Star Wars fan?",
+    "Are you familiar with the Expanded Universe?",
+    "Are you an Expanded Universe fan?",
+    "Are you a Star Trek fan?",
+]
+
+# Favorability answers in code order; missing answers are coded the same as "Unfamiliar (N/A)"
+FAVORABILITY = [
+    "Very favorably",
+    "Somewhat favorably",
+    "Neither favorably nor unfavorably (neutral)",
+    "Somewhat unfavorably",
+    "Very unfavorably",
+    "Unfamiliar (N/A)",
+]
+
+AGES = ["18-29", "30-44", "45-60", "> 60"]
+
+INCOMES = [
+    "$0 - $24,999",
+    "$25,000 - $49,999",
+    "$50,000 - $99,999",
+    "$100,000 - $149,999",
+    "$150,000+",
+]
+
+# Each entry recodes one block of columns, given by name or by position after renaming
+SCHEMA = [
+    {"columns": YES_NO_COLUMNS, "kind": "yes_no"},
+    {"columns": slice(3, 9), "kind": "watched"},
+    {"columns": slice(9, 15), "kind": "rank"},
+    {"columns": slice(15, 29), "kind": "favorability"},
+    {"columns": ["Age"], "kind": "category", "categories": AGES},
+    {"columns": ["Household Income"], "kind": "category", "categories": INCOMES},
+    {"columns": [
+        "Which character shot first?",
+        "Gender",
+        "Education",
+        "Location (Census Region)",
+    ], "kind": "category"},
+]
+
+
+def yes_no(block):
+    """'Yes' -> True; 'No' and missing answers -> False."""
+    return block.to_numpy(dtype=object) == "Yes"
+
+
+def watched(block):
+    """Any movie title -> True; missing answers -> False."""
+    return block.notna().to_numpy()
+
+
+def rank(block):
+    """Ranks 1-6 kept as float32 so unanswered ranks stay NaN and drop out of means."""
+    return block.to_numpy(dtype="float32")
+
+
+def favorability(block):
+    """Favorability answers -> uint8 codes 1-6, with missing answers coded 6."""
+    values = block.to_numpy(dtype=object).ravel()
+    codes = pd.Categorical(values, categories=FAVORABILITY).codes
+    codes = np.where(codes < 0, len(FAVORABILITY) - 1, codes) + 1
+    return codes.astype("uint8").reshape(block.shape)
+
+
+RECODERS = {
+    "yes_no": yes_no,
+    "watched": watched,
+    "rank": rank,
+    "favorability": favorability,
+}
+
+
+def block_columns(frame, columns):
+    if isinstance(columns, slice):
+        return list(frame.columns[columns])
+    return [column for column in columns if column in frame.columns]
+
+
+def recode(frame, schema=SCHEMA):
+    """Returns a copy of the renamed survey with every schema block recoded to compact dtypes.
+
+    Each block is recoded with one vectorized call over all of its columns at once.
+
+    Args:
+    - frame (DataFrame): survey with the renamed column headers
+    - schema (list): blocks to recode, see SCHEMA
+    """
+    recoded = frame.copy()
+
+    for spec in schema:
+        columns = block_columns(frame, spec["columns"])
+        if not columns:
+            continue
+
+        if spec["kind"] == "category":
+            for column in columns:
+                categories = spec.get("categories")
+                if categories is None:
+                    recoded[column] = frame[column].astype("category")
+                else:
+                    recoded[column] = pd.Categorical(frame[column], categories=categories, ordered=True)
+            continue
+
+        values = RECODERS[spec["kind"]](frame[columns])
+        recoded[columns] = pd.DataFrame(values, index=frame.index, columns=columns)
+
+    return recoded
@@ -0,0 +1,68 @@
+import numpy as np
+
+SEEN = "Have you seen at least one Star Wars film?"
+FAN = "Are you a Star Wars fan?"
+TREK_FAN = "Are you a Star Trek fan?"
+WATCHED_COLUMNS = [f"Watched Ep {i}" for i in range(1, 7)]
+
+# Each segment is a boolean reduction over the recoded survey, built from other cached segments
+DEFINITIONS = {
+    "everyone": lambda s: np.ones(len(s.frame), dtype=bool),
+    "claims_seen": lambda s: s.column(SEEN),
+    "not_seen": lambda s: ~s.mask("claims_seen"),
+    "false_positives": lambda s: s.mask("claims_seen") & (s.watched_count == 0),
+    "seen": lambda s: s.mask("claims_seen") & (s.watched_count > 0),
+    "seen_all": lambda s: s.mask("claims_seen") & (s.watched_count == len(WATCHED_COLUMNS)),
+    "fans": lambda s: s.mask("seen") & s.column(FAN),
+    "true_fans": lambda s: s.mask("seen_all") & s.column(FAN),
+    "trek_fans": lambda s: s.mask("seen") & s.column(TREK_FAN),
+}
+
+
+class Segments:
+    """Cached respondent masks over the recoded Star Wars survey.
+
+    Every segment is computed once as a boolean array over the full survey, so populations
+    such as fans or true fans by gender are combined from cached masks instead of re-filtering
+    frames that were already filtered.
+
+    Args:
+    - frame (DataFrame): survey recoded with recoding.recode
+    - definitions (dict): segment name -> function returning a mask, see DEFINITIONS
+    """
+
+    def __init__(self, frame, definitions=DEFINITIONS):
+        self.frame = frame
+        self.definitions = definitions
+        self.watched_count = frame[WATCHED_COLUMNS].to_numpy(dtype=bool).sum(axis=1)
+        self._columns = {}
+        self._masks = {}
+
+    def column(self, name):
+        """Returns a Yes/No column as a boolean array."""
+        if name not in self._columns:
+            self._columns[name] = self.frame[name].to_numpy(dtype=bool)
+        return self._columns[name]
+
+    def mask(self, name, **equals):
+        """Returns the cached mask of a segment, optionally narrowed by column == value pairs.
+
+        Example: segments.mask("true_fans", Gender="Female")
+        """
+        key = (name, tuple(sorted(equals.items())))
+        if key not in self._masks:
+            if equals:
+                mask = self.mask(name).copy()
+                for column, value in equals.items():
+                    mask &= (self.frame[column] == value).to_numpy(dtype=bool)
+            else:
+                mask = self.definitions[name](self)
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def population(self, name, **equals):
+        """Returns the rows of the survey in a segment."""
+        return self.frame[self.mask(name, **equals)]
+
+    def size(self, name, **equals):
+        return int(self.mask(name, **equals).sum())
@@ -0,0 +1,80 @@
+"""Benchmarks Factbook top-N queries against the notebook's ORDER BY-expression queries.
+
+Runs on a temporary copy of factbook.db whose facts are repeated to --rows rows, so the
+original database is left untouched.
+
+Usage: python benchmark_queries.py [--rows 1000000] [--repeat 20]
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from factbook import Factbook
+
+# The notebook's expressions, computed per row with the whole table sorted. Aliased as "value"
+# so they are not resolved to the generated columns of the same name.
+NOTEBOOK_EXPRESSIONS = {
+    "population_density": "CAST(population AS FLOAT)/area_land",
+    "land_to_water_ratio": "CAST(area_land AS FLOAT)/area_water",
+    "annual_growth": "CAST(population*population_growth/100 AS INT)",
+}
+NOTEBOOK_QUERY = """
+    SELECT name, {expression} AS value
+      FROM facts
+     WHERE is_a_country = 1 AND {expression} IS NOT NULL
+     ORDER BY value DESC
+     LIMIT 5"""
+
+COLUMNS = "code, name, area, area_land, area_water, population, population_growth, birth_rate, death_rate, " \
+          "migration_rate, is_a_country"
+
+
+def enlarge(path, rows):
+    """Appends copies of the original facts until the table has about `rows` rows."""
+    connection = sqlite3.connect(path)
+    original = connection.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+    copies = max(rows // original - 1, 0)
+    with connection:
+        connection.execute(f"""
+            INSERT INTO facts ({COLUMNS})
+            WITH RECURSIVE copy(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM copy WHERE n < ?)
+            SELECT {COLUMNS} FROM facts, copy
+        """, (copies,))
+    connection.close()
+
+
+def timed(run, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = run()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "factbook.db")
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "factbook.db"), path)
+        enlarge(path, args.rows)
+
+        with Factbook(path, prepare=True) as factbook:
+            n_rows = factbook.connection.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
+            print(f"{n_rows:,} rows")
+            for metric, expression in NOTEBOOK_EXPRESSIONS.items():
+                sql = NOTEBOOK_QUERY.format(expression=expression)
+                sort_seconds, expected = timed(lambda: factbook.connection.execute(sql).fetchall(), args.repeat)
+                index_seconds, result = timed(lambda: factbook.top(metric, 5), args.repeat)
+                assert [value for _, value in result] == [value for _, value in expected]
+                print(f"{metric}: full sort {sort_seconds * 1000:.2f}ms, index {index_seconds * 1000:.3f}ms "
+                      f"({factbook.query_plan(metric)[0]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import sqlite3
+
+# Derived metric -> (column type, SQL expression), added to facts as generated columns
+METRICS = {
+    "population_density": ("REAL", "CAST(population AS FLOAT) / area_land"),
+    "population_to_area": ("REAL", "CAST(population AS FLOAT) / area"),
+    "land_to_water_ratio": ("REAL", "CAST(area_land AS FLOAT) / area_water"),
+    "annual_growth": ("INTEGER", "CAST(population * population_growth / 100 AS INT)"),
+    "natural_increase": ("REAL", "birth_rate - death_rate"),
+}
+
+# Columns indexed on (is_a_country, column, name) for top-N and bottom-N queries
+INDEXED = [*METRICS, "population", "population_growth", "birth_rate", "death_rate", "area"]
+
+
+class Factbook:
+    """Query layer over the facts table of factbook.db.
+
+    Opening a database does not change it: until prepare() is called, the METRICS are computed
+    from their expressions and every query sorts the table. prepare() writes to the file. It adds
+    every METRICS expression as a virtual generated column, so it stays right after UPDATEs to
+    the underlying columns, and an index on (is_a_country, column, name) for every INDEXED
+    column. A countries-only top-N query is then a range scan of the index from one end, reading
+    N entries, instead of computing the expression for every row and sorting. The index covers
+    the query for stored columns; for generated columns SQLite still reads the N matching rows.
+    Queries over all rows (countries_only=False) still sort.
+
+    Generated columns need SQLite 3.31 or later to read the file afterwards, so prepare a copy
+    (as benchmark_queries.py does) rather than the committed factbook.db.
+
+    The SQL of every query is built once; sqlite3 caches the compiled statement per SQL text, so
+    repeated calls only bind the limit.
+
+    Args:
+    - path (str): e.g. "factbook.db"
+    - prepare (bool): add the generated columns and indexes if missing
+    """
+
+    def __init__(self, path, prepare=False):
+        self.connection = sqlite3.connect(path)
+        self._queries = {}
+        self._columns = set(self.columns())
+        if prepare:
+            self.prepare()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def columns(self):
+        return [row[1] for row in self.connection.execute("PRAGMA table_xinfo(facts)")]
+
+    def prepare(self):
+        with self.connection:
+            for metric, (column_type, expression) in METRICS.items():
+                if metric not in self._columns:
+                    self.connection.execute(
+                        f"ALTER TABLE facts ADD COLUMN {metric} {column_type} "
+                        f"GENERATED ALWAYS AS ({expression}) VIRTUAL"
+                    )
+            for column in INDEXED:
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS facts_country_{column} ON facts (is_a_country, {column}, name)"
+                )
+        self._columns = set(self.columns())
+        self._queries = {}
+
+    def _query(self, metric, descending, countries_only):
+        if metric not in INDEXED:
+            raise ValueError(f"unknown metric {metric!r}, expected one of {INDEXED}")
+        key = metric, descending, countries_only
+        if key not in self._queries:
+            where = "is_a_country = 1 AND " if countries_only else ""
+            value = metric if metric in self._columns else f"({METRICS[metric][1]})"
+            self._queries[key] = (
+                f"SELECT name, {value} FROM facts "
+                f"WHERE {where}{value} IS NOT NULL "
+                f"ORDER BY {value} {'DESC' if descending else 'ASC'} LIMIT ?"
+            )
+        return self._queries[key]
+
+    def top(self, metric, n=5, countries_only=True):
+        """The n (name, value) rows with the largest metric, largest first; NULLs are skipped."""
+        return self.connection.execute(self._query(metric, True, countries_only), (n,)).fetchall()
+
+    def bottom(self, metric, n=5, countries_only=True):
+        """The n (name, value) rows with the smallest metric, smallest first; NULLs are skipped."""
+        return self.connection.execute(self._query(metric, False, countries_only), (n,)).fetchall()
+
+    def query_plan(self, metric, descending=True, countries_only=True):
+        """SQLite's plan for a top (or bottom) query, e.g. to check it uses the covering index."""
+        plan = self.connection.execute(f"EXPLAIN QUERY PLAN {self._query(metric, descending, countries_only)}", (5,))
+        return [row[-1] for row in plan]